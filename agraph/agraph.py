@@ -1,14 +1,24 @@
-from typing import Callable, List
+from typing import Callable, Iterable, Iterator, List, Optional
 
 
+from agraph.builders import BuilderRegistry, shared_builders
 from agraph.compiler import AGraphCompiler
-from agraph.model import AGraphModel
+from agraph.incremental import TopologyDelta
+from agraph.model import AGraphModel, shared_model
+from agraph.result import AGraphResult
+from agraph.snapshot import AGraphSnapshot, CloneHooks
+from agraph.template import ASYNC_CONCURRENCY, AGraphTemplate
+from agraph.topology import AUTO_BACKEND, Topology
 
 
 class AGraph:
-    def __init__(self):
-        self.model: AGraphModel = AGraphModel()
-        self.compiler: AGraphCompiler = AGraphCompiler(self.model)
+    def __init__(self, backend: str = AUTO_BACKEND, cache_dir: Optional[str] = None, shared: bool = False):
+        # Nodes and builders are registered to this instance, with shared=True the ones in shared_model and
+        # shared_builders are used too
+        self.model: AGraphModel = AGraphModel(shared_model if shared else None)
+        builders = BuilderRegistry(shared_builders if shared else None)
+        self.compiler: AGraphCompiler = AGraphCompiler(self.model, backend, cache_dir, builders)
+        self.clone_hooks: CloneHooks = {}
 
     def register_node(self, id: str, node: object) -> None:
         self.model.register_node(id, node)
@@ -16,11 +26,48 @@ class AGraph:
     def set_representation(self, representation: str) -> None:
         self.compiler.set_representation(representation)
 
+    def update_representation(self, representation: str) -> TopologyDelta:
+        # Sets an edited version of the diagram and tells which nodes and edges changed since the previous update
+        return self.compiler.update_representation(representation)
+
     def register_node_builder(self, type, build_node: Callable) -> None:
         self.compiler.register_node_builder(type, build_node)
 
+    def register_bulk_node_builder(self, type, build_nodes: Callable) -> None:
+        self.compiler.register_bulk_node_builder(type, build_nodes)
+
     def register_relation_builder(self, type1, type2, build_relation: Callable) -> None:
         self.compiler.register_relation_builder(type1, type2, build_relation)
 
-    def build(self) -> List[List]:
-        return self.compiler.compile()
+    def register_bulk_relation_builder(self, type1, type2, build_relations: Callable) -> None:
+        self.compiler.register_bulk_relation_builder(type1, type2, build_relations)
+
+    def register_clone_hook(self, type, clone: Callable[[object], object]) -> None:
+        # Objects of the type (or its subclasses) which can't be deep copied - clones of snapshots get clone(object)
+        self.clone_hooks[type] = clone
+
+    def build(self, workers: Optional[int] = None, lazy: bool = False) -> AGraphResult:
+        # Lazy build returns stand-ins of nodes, a node and all nodes connected to it are built on the first use of one
+        return self.compiler.compile(workers, lazy)
+
+    def build_snapshot(self, workers: Optional[int] = None) -> AGraphSnapshot:
+        # The graph is built once, snapshot.clone() copies it
+        return AGraphSnapshot(self.compiler.compile(workers), self.clone_hooks)
+
+    async def abuild(self, concurrency: int = ASYNC_CONCURRENCY) -> AGraphResult:
+        return await self.compiler.acompile(concurrency)
+
+    def iter_edges(self, stream: Iterable[str]) -> Iterator[List]:
+        # Lines of a large diagram, e.g. an open file - connected nodes are built and yielded while reading it
+        return self.compiler.iter_edges(stream)
+
+    def build_from_file(self, path: str, encoding: str = 'utf-8') -> Iterator[List]:
+        with open(path, encoding=encoding) as file:
+            yield from self.compiler.iter_edges(file)
+
+    def compile_many(self, representations: Iterable[str], workers: Optional[int] = None) -> List[Topology]:
+        # Only parses the diagrams, later builds and templates of the same representations reuse the topologies
+        return self.compiler.compile_topologies(representations, workers)
+
+    def compile_template(self, representation: str, generate_code: bool = False) -> AGraphTemplate:
+        return self.compiler.compile_template(representation, generate_code)
@@ -0,0 +1,124 @@
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from agraph.streaming import EMPTY_ROW, BoundaryLink, EdgeSegment, StreamRow, resolve_row
+from agraph.topology import AUTO_BACKEND, Topology, compile_topology, split_representation_lines
+
+
+MIN_BAND_ROWS = 256 # smaller bands cost more to send to workers than to resolve
+
+class BandComponent(NamedTuple):
+    # Edge cells of a band joined so far, endpoints' node indices are band's
+    endpoints: List[Tuple[int, str, int]] # (node index, id, direction relative to component's side 0)
+    first_cell: Tuple[int, int] # (col, row)
+    first_parity: int
+
+class Band(NamedTuple):
+    first_row: int # the row the band was resolved at
+    line_node_counts: List[int] # node occurrences of band's lines
+    node_ids: List[str]
+    components: List[BandComponent]
+    first_row_cells: Dict[int, Tuple[int, int]] # col => (component, parity), cells of band's first row
+    last_row_cells: Dict[int, Tuple[int, int]] # the same for band's last row
+    last_row_connectors: Dict[int, List[Tuple[int, int]]] # col => connector's connected offsets
+    boundary_links: List[BoundaryLink] # first row's links to the previous band's last row
+
+def resolve_band(previous_line: Optional[str], lines: List[str], next_line: Optional[str], first_row: int) -> Band:
+    # Lines of the band with the neighbour bands' lines next to it, which are read but not resolved
+    rows = []
+    node_ids = []
+    for line in lines:
+        rows.append(StreamRow(line, len(node_ids)))
+        node_ids.extend(rows[-1].node_ids)
+    # Nodes of the previous band's last row precede band's nodes, the next band's nodes follow them
+    previous_row = EMPTY_ROW
+    if previous_line is not None:
+        previous_row = StreamRow(previous_line, 0)
+        previous_row = StreamRow(previous_line, -len(previous_row.node_ids))
+    next_row = StreamRow(next_line, len(node_ids)) if next_line is not None else EMPTY_ROW
+
+    segments: List[EdgeSegment] = []
+    boundary_links: List[BoundaryLink] = []
+    labels: Optional[Dict[int, EdgeSegment]] = None if previous_line is not None else {}
+    connectors: Dict[int, List[Tuple[int, int]]] = {}
+    first_labels: Dict[int, EdgeSegment] = {}
+    for index, row in enumerate(rows):
+        labels, connectors = resolve_row(
+            rows[index - 1] if index > 0 else previous_row, row, rows[index + 1] if index + 1 < len(rows) else next_row,
+            first_row + index, labels, connectors, {}, boundary_links
+        )
+        segments.extend(labels.values())
+        if index == 0:
+            first_labels = labels
+
+    components: List[BandComponent] = []
+    component_indices: Dict[EdgeSegment, int] = {}
+    for segment in segments:
+        root = segment.find()[0]
+        if root not in component_indices:
+            component_indices[root] = len(components)
+            components.append(BandComponent(root.endpoints, root.first_cell, root.first_parity))
+    def cells(row_labels: Dict[int, EdgeSegment]) -> Dict[int, Tuple[int, int]]:
+        return {col: (component_indices[segment.find()[0]], segment.find()[1]) for col, segment in row_labels.items()}
+    return Band(first_row, [len(row.node_ids) for row in rows], node_ids, components, cells(first_labels), cells(labels or {}), connectors, boundary_links)
+
+def merge_bands(bands: List[Band], first_rows: Optional[List[int]] = None) -> Topology:
+    # Components of all bands joined by the links across bands' boundaries, edges ordered as by compile_topology.
+    # Bands can be moved to other first rows, if lines were inserted or removed above them.
+    segments: List[List[EdgeSegment]] = []
+    node_count = 0
+    for band_index, band in enumerate(bands):
+        row_offset = first_rows[band_index] - band.first_row if first_rows is not None else 0
+        band_segments = []
+        for component in band.components:
+            segment = EdgeSegment(component.first_cell[1] + row_offset, component.first_cell[0])
+            segment.endpoints = [(node_count + node_index, id, direction) for node_index, id, direction in component.endpoints]
+            segment.first_parity = component.first_parity
+            band_segments.append(segment)
+        segments.append(band_segments)
+        node_count += len(band.node_ids)
+
+    for band_index in range(1, len(bands)):
+        band, previous_band = bands[band_index], bands[band_index - 1]
+        for link in band.boundary_links:
+            component, parity = band.first_row_cells[link.col]
+            previous_component, previous_parity = previous_band.last_row_cells[link.previous_col]
+            same_direction = link.same_direction
+            if same_direction is None:
+                same_direction = link.side != previous_band.last_row_connectors[link.previous_col].index(link.connector_offset)
+            # Components are joined through their cells
+            segments[band_index][component].union(segments[band_index - 1][previous_component], same_direction != (parity != previous_parity))
+
+    roots = sorted({segment.find()[0] for band_segments in segments for segment in band_segments}, key=lambda root: root.first_cell)
+    edges = []
+    for root in roots:
+        if len(root.endpoints) != 2:
+            col, row = root.first_cell
+            raise ValueError(f'Edge at line {row + 1}, column {col + 1} does not connect two nodes')
+        endpoint1, endpoint2 = root.endpoints
+        if endpoint1[2] != root.first_parity:
+            endpoint1, endpoint2 = endpoint2, endpoint1
+        edges.append((endpoint1[0], endpoint2[0]))
+    return Topology(tuple(node_id for band in bands for node_id in band.node_ids), tuple(edges))
+
+def compile_topology_in_bands(representation: str, workers: Optional[int] = None, band_rows: Optional[int] = None) -> Topology:
+    # The same topology as compile_topology, diagram's bands are resolved in worker processes. Resolving a band is
+    # slower than the serial engine, so one worker or one band are compiled serially unless band_rows are given.
+    lines = split_representation_lines(representation)
+    workers = workers or os.cpu_count() or 1
+    if band_rows is None and (workers == 1 or len(lines) <= MIN_BAND_ROWS):
+        return compile_topology(representation, AUTO_BACKEND)
+    band_rows = band_rows or max(MIN_BAND_ROWS, -(-len(lines) // workers))
+    band_starts = range(0, len(lines), band_rows)
+    arguments = [
+        (lines[start - 1] if start > 0 else None, lines[start:start + band_rows], lines[start + band_rows] if start + band_rows < len(lines) else None, start)
+        for start in band_starts
+    ]
+    if workers == 1 or len(arguments) == 1:
+        bands = [resolve_band(*band_arguments) for band_arguments in arguments]
+    else:
+        with ProcessPoolExecutor(min(workers, len(arguments))) as executor:
+            bands = list(executor.map(resolve_band, *zip(*arguments)))
+    return merge_bands(bands)
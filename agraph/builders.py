@@ -0,0 +1,88 @@
+from threading import RLock
+from typing import Callable, Dict, Optional, Tuple
+
+from agraph.node import BulkNodeBuilder
+from agraph.template import BulkRelationBuilder, RelationBuilders, RelationDispatch
+from agraph.trie import PrefixTrie
+
+
+class BuilderRegistry:
+    # Node and relation builders of a compiler. Builders of the shared registry underneath are used too, the ones
+    # registered here take precedence.
+    def __init__(self, shared: Optional['BuilderRegistry'] = None):
+        self.shared = shared
+        self.node_builders: Dict[str, Callable] = {}
+        self.node_types: Dict[str, type] = {} # type name => type its node builder was registered for
+        self.relation_builders: RelationBuilders = {}
+        self.__node_builder_index: PrefixTrie[Callable] = PrefixTrie() # longest matching type name for a node id
+        self.__version = 0
+        self.__lock = RLock()
+        self.__relation_dispatch: Optional[Tuple[int, RelationDispatch]] = None # (version, dispatch)
+
+    @property
+    def version(self) -> int:
+        # Changes with every registration, here or in the shared registries
+        return self.__version + (self.shared.version if self.shared is not None else 0)
+
+    def register_node_builder(self, type, build_node: Callable) -> None:
+        with self.__lock:
+            self.node_builders[type.__name__] = build_node
+            self.node_types[type.__name__] = type
+            self.__node_builder_index.insert(type.__name__, build_node)
+            self.__version += 1
+
+    def register_bulk_node_builder(self, type, build_nodes: Callable) -> None:
+        # build_nodes gets ids' suffixes of all nodes of the type in a diagram and returns the nodes in the same order
+        self.register_node_builder(type, BulkNodeBuilder(build_nodes))
+
+    def register_relation_builder(self, type1, type2, build_relation: Callable) -> None:
+        # Is it possible to detect build_relation's parameters' types and return type? Lambdas doesn't provide such information.
+        # Maybe hash*hash
+        # What if builder is already registered?
+        with self.__lock:
+            # Copy on write, so snapshots don't need to lock
+            relation_builders = dict(self.relation_builders)
+            relation_builders[type1] = {**relation_builders.get(type1, {}), type2: build_relation}
+            self.relation_builders = relation_builders
+            self.__version += 1
+        # TODO The following case requires switching parameters of build_relation function
+        # if type2 not in self.relation_builders:
+        #     self.relation_builders[type2] = {}
+        # self.relation_builders[type2][type1] = build_relation
+
+    def register_bulk_relation_builder(self, type1, type2, build_relations: Callable) -> None:
+        # build_relations gets (type1 node, type2 node) pairs of all edges of the types once the diagram's nodes are built
+        self.register_relation_builder(type1, type2, BulkRelationBuilder(type1, type2, build_relations))
+
+    def node_builder(self, id: str) -> Optional[Tuple[str, Callable]]:
+        # (type name, builder) of the longest type name matching the id, the one registered here if both match
+        with self.__lock:
+            type_candidate = self.__node_builder_index.longest_prefix(id)
+        shared_type_candidate = self.shared.node_builder(id) if self.shared is not None else None
+        if type_candidate is None or shared_type_candidate is not None and len(shared_type_candidate[0]) > len(type_candidate[0]):
+            return shared_type_candidate
+        return type_candidate
+
+    def node_type(self, type_name: str) -> Optional[type]:
+        if type_name in self.node_types:
+            return self.node_types[type_name]
+        return self.shared.node_type(type_name) if self.shared is not None else None
+
+    def relation_builders_snapshot(self) -> RelationBuilders:
+        relation_builders = self.shared.relation_builders_snapshot() if self.shared is not None else {}
+        for type1, builders in self.relation_builders.items():
+            relation_builders[type1] = {**relation_builders.get(type1, {}), **builders}
+        return relation_builders
+
+    def relation_dispatch(self) -> RelationDispatch:
+        # Shared by templates until the next registration, so builders for node types are looked up once
+        version = self.version
+        relation_dispatch = self.__relation_dispatch
+        if relation_dispatch is None or relation_dispatch[0] != version:
+            relation_dispatch = (version, RelationDispatch(self.relation_builders_snapshot()))
+            self.__relation_dispatch = relation_dispatch
+        return relation_dispatch[1]
+
+
+# Opt-in builders visible to all compilers created with the shared registry
+shared_builders = BuilderRegistry()
@@ -0,0 +1,94 @@
+import hashlib
+import os
+import struct
+import tempfile
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Generic, Hashable, Optional, TypeVar
+
+from agraph.topology import TOPOLOGY_VERSION, Topology
+
+
+V = TypeVar('V')
+
+class LRUCache(Generic[V]):
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = Lock()
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        with self.__lock:
+            if key not in self.__entries:
+                return default
+            self.__entries.move_to_end(key)
+            return self.__entries[key]
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+class TopologyCache:
+    # Compiled topologies by representation's content hash, kept in memory and optionally as files in a directory.
+    # Files are written to a temporary file and then renamed, so processes sharing the directory never read partial files.
+    __directory_caches: Dict[str, 'TopologyCache'] = {}
+    __directory_caches_lock = Lock()
+
+    def __init__(self, directory: Optional[str] = None, maxsize: int = 256):
+        self.directory = directory
+        self.__memory: LRUCache[Topology] = LRUCache(maxsize)
+
+    @classmethod
+    def for_directory(cls, directory: Optional[str]) -> 'TopologyCache':
+        # One cache (with its memory layer) per directory in a process
+        directory = os.path.abspath(directory) if directory is not None else None
+        with cls.__directory_caches_lock:
+            if directory not in cls.__directory_caches:
+                cls.__directory_caches[directory] = cls(directory)
+            return cls.__directory_caches[directory]
+
+    @staticmethod
+    def key(representation: str) -> str:
+        return hashlib.sha256(f'{TOPOLOGY_VERSION}\n{representation}'.encode('utf-8')).hexdigest()
+
+    def get(self, representation: str) -> Optional[Topology]:
+        key = self.key(representation)
+        topology = self.__memory.get(key)
+        if topology is None and self.directory is not None:
+            try:
+                with open(self.__path(key), 'rb') as file:
+                    topology = Topology.from_bytes(file.read())
+            except (OSError, ValueError, struct.error):
+                return None
+            self.__memory.put(key, topology)
+        return topology
+
+    def put(self, representation: str, topology: Topology) -> None:
+        key = self.key(representation)
+        self.__memory.put(key, topology)
+        if self.directory is not None:
+            temporary_path = None
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{key}.')
+                with os.fdopen(file_descriptor, 'wb') as file:
+                    file.write(topology.to_bytes())
+                os.replace(temporary_path, self.__path(key))
+            except OSError:
+                # Cache is only an optimization - unwritable directory must not break compilation
+                if temporary_path is not None and os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.agt')
@@ -0,0 +1,75 @@
+from typing import Callable, Dict, List, Tuple
+
+from agraph.cache import LRUCache
+from agraph.template import AGraphTemplate, BulkRelationBuilder
+
+
+# Generated source => compiled code, templates of the same shape share the code
+compiled_sources: LRUCache = LRUCache(maxsize=256)
+
+def generate_instantiate(template: AGraphTemplate, node_types: Dict[int, type]) -> Tuple[str, Callable[[], List[List]]]:
+    # Straight-line function building nodes and relations in the order of AGraphTemplate.instantiate. Relation builders
+    # are chosen for the given node types, nodes of other types fall back to the template's relation dispatch.
+    # 'Company-Employee1' =>
+    # def instantiate():
+    #     bulk_relations = {}
+    #     node0 = build_node0(*node_args0)
+    #     type0 = type(node0)
+    #     node1 = build_node1(*node_args1)
+    #     type1 = type(node1)
+    #     if type0 is node_type0 and type1 is node_type1:
+    #         build_relation0(node0, node1)
+    #     else:
+    #         build_relation(node0, node1, bulk_relations)
+    #     build_bulk_relations(bulk_relations)
+    #     return [[node0, node1]]
+    namespace = {
+        'build_relation': template.build_relation,
+        'build_bulk_nodes': template.build_bulk_nodes,
+        'build_bulk_relations': template.build_bulk_relations,
+    }
+    lines = ['def instantiate():', '    bulk_relations = {}']
+    built_nodes = set()
+    if any(resolution is not None and resolution.bulk for resolution in template.node_resolutions):
+        lines.append('    bulk_nodes = build_bulk_nodes()')
+    for edge_index, edge in enumerate(template.topology.edges):
+        for node_index in edge:
+            if node_index in built_nodes:
+                continue
+            built_nodes.add(node_index)
+            resolution = template.node_resolutions[node_index]
+            if resolution is None:
+                lines.append(f'    node{node_index} = None')
+            elif resolution.bulk:
+                lines.append(f'    node{node_index} = bulk_nodes[{node_index}]')
+            else:
+                namespace[f'build_node{node_index}'] = resolution.build_node
+                namespace[f'node_args{node_index}'] = resolution.args
+                lines.append(f'    node{node_index} = build_node{node_index}(*node_args{node_index})')
+            lines.append(f'    type{node_index} = type(node{node_index})')
+            namespace[f'node_type{node_index}'] = node_types[node_index]
+
+        node_index1, node_index2 = edge
+        relation_builder = template.relation_builder(node_types[node_index1], node_types[node_index2])
+        lines.append(f'    if type{node_index1} is node_type{node_index1} and type{node_index2} is node_type{node_index2}:')
+        if relation_builder is None:
+            lines.append('        pass')
+        else:
+            namespace[f'build_relation{edge_index}'], reversed_nodes = relation_builder
+            nodes = f'node{node_index2}, node{node_index1}' if reversed_nodes else f'node{node_index1}, node{node_index2}'
+            if isinstance(relation_builder[0], BulkRelationBuilder):
+                lines.append(f'        bulk_relations.setdefault(build_relation{edge_index}, []).append(({nodes}))')
+            else:
+                lines.append(f'        build_relation{edge_index}({nodes})')
+        lines.append('    else:')
+        lines.append(f'        build_relation(node{node_index1}, node{node_index2}, bulk_relations)')
+    lines.append('    build_bulk_relations(bulk_relations)')
+    lines.append('    return [{}]'.format(', '.join(f'[node{node_index1}, node{node_index2}]' for node_index1, node_index2 in template.topology.edges)))
+    source = '\n'.join(lines) + '\n'
+
+    code = compiled_sources.get(source)
+    if code is None:
+        code = compile(source, '<agraph template>', 'exec')
+        compiled_sources.put(source, code)
+    exec(code, namespace)
+    return source, namespace['instantiate']
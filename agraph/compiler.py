@@ -1,176 +1,178 @@
-import sys, inspect
+import os
 
-from itertools import product
-from functools import reduce
-from typing import List, Callable, Set
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Callable, Optional
 
+from agraph.builders import BuilderRegistry
+from agraph.cache import LRUCache, TopologyCache
+from agraph.incremental import IncrementalTopology, TopologyDelta
 from agraph.model import AGraphModel
-from agraph.edge import Edge, EdgeFactory
-from agraph.node import Node
-from agraph.point import Point
+from agraph.node import BulkNodeBuilder, NodeResolution
+from agraph.registry import class_registry
+from agraph.result import AGraphResult
+from agraph.streaming import iter_topology_edges
+from agraph.template import ASYNC_CONCURRENCY, AGraphTemplate, BulkRelationBuilder
+from agraph.topology import AUTO_BACKEND, Topology, compile_topology
 
 
-class AGraphCompiler:
-    relation_builders = {}
-    node_builders = {}
+# Class registry is global, so are types resolved from it: (node id, class registry version) => type resolution
+class_resolutions: LRUCache[Optional[NodeResolution]] = LRUCache(maxsize=4096)
+NOT_RESOLVED = object() # memo miss, None is a memoized missing resolution
 
-    def __init__(self, model: AGraphModel = None):
+class AGraphCompiler:
+    def __init__(self, model: AGraphModel = None, backend: str = AUTO_BACKEND, cache_dir: Optional[str] = None, builders: Optional[BuilderRegistry] = None):
         self.model = model or AGraphModel()
-        self.__build_class_registry()
+        self.builders = builders or BuilderRegistry()
+        self.backend = backend
+        # Compiled topologies are always cached in memory, the directory lets other processes and later runs reuse them
+        self.topology_cache = TopologyCache.for_directory(cache_dir or os.environ.get('AGRAPH_CACHE_DIR'))
+        self.node_resolutions: LRUCache[Optional[NodeResolution]] = LRUCache(maxsize=4096) # node id => builder's resolution or None
+        self.__node_resolutions_builders_version = self.builders.version
+        self.incremental_topology = IncrementalTopology()
 
     def set_representation(self, representation: str) -> None:
         self.representation = representation
 
+    def update_representation(self, representation: str) -> TopologyDelta:
+        # Only lines edited since the previous update are resolved again, the topology is then cached for builds
+        delta = self.incremental_topology.update(representation)
+        self.topology_cache.put(representation, delta.topology)
+        self.representation = representation
+        return delta
+
     def register_node_builder(self, type, build_node: Callable) -> None:
-        self.node_builders[type.__name__] = build_node
+        self.builders.register_node_builder(type, build_node)
+
+    def register_bulk_node_builder(self, type, build_nodes: Callable) -> None:
+        self.builders.register_bulk_node_builder(type, build_nodes)
 
     def register_relation_builder(self, type1, type2, build_relation: Callable) -> None:
-        # Is it possible to detect build_relation's parameters' types and return type? Lambdas doesn't provide such information.
-        # Maybe hash*hash
-        # What if builder is already registered?
-        if type1 not in self.relation_builders:
-            self.relation_builders[type1] = {}
-        self.relation_builders[type1][type2] = build_relation
-        # TODO The following case requires switching parameters of build_relation function
-        # if type2 not in self.relation_builders:
-        #     self.relation_builders[type2] = {}
-        # self.relation_builders[type2][type1] = build_relation
-
-    def compile(self) -> List:
-        lines = self.__split_representation_lines(self.representation)
-        matrix = []
-        matrix_max_x = max(list(map(lambda line: len(line), lines)))
-        matrix_max_y = len(lines)
-        for line in lines:
-            node_ids = self.__separate_identifiers(line)
-            matrix_row = [None] * matrix_max_x # [None, None, None, None, None, None]
-            # 'N1 N12' => ['N1', 'N1', None, 'N12', 'N12', 'N12']
-            # Mark nodes on matrix
-            after_end_index = 0
-            for node_id in node_ids:
-                start_index = line.index(node_id, after_end_index)
-                after_end_index = start_index + len(node_id)
-                node = Node(node_id)
-                for occupied_position in range(start_index, after_end_index):
-                    matrix_row[occupied_position] = node
-
-            # Mark edges on matrix
-            for col in range(0, len(line)):
-                edge = EdgeFactory.make_edge(line[col])
-                if edge is not None:
-                    matrix_row[col] = edge
-
-            matrix.append(matrix_row)
-
-        # Matrix is constructed
-        edges = []
-
-        for column_index, row_index in product(range(matrix_max_x), range(matrix_max_y)):
-            try:
-                if isinstance(matrix[row_index][column_index], Edge):
-                    edges.append(self.__resolve_edge(matrix, row_index, column_index))
-            except IndexError:
-                continue
-
-        return edges
-
-    def __resolve_edge(self, matrix: List[List[str]], edge_row_index: int, edge_column_index: int) -> List[str]:
-        nodes: List[str] = [None, None]
-        # get connected matrix cells coordinates (each eadge character should have its own resolver)
-        # cords - coordinates
-        edge = matrix[edge_row_index][edge_column_index]
-        connected_cells_cords: List[Point] = edge.connected_cells(matrix, edge_row_index, edge_column_index)
-        c: List[Point] = connected_cells_cords
-        # remove edge from matrix
-        matrix[edge_row_index][edge_column_index] = None
-
-        for i in range(2):
-            connected_cell = c[i]
-            while isinstance(matrix[connected_cell.row][connected_cell.col], Edge):
-                edge = matrix[connected_cell.row][connected_cell.col]
-                edge_connected_cells: List[Point] = edge.connected_cells(matrix, connected_cell.row, connected_cell.col)
-                e: List[Point] = edge_connected_cells
-                if matrix[e[0].row][e[0].col] is not None:
-                    connected_cell_cords = e[0]
+        self.builders.register_relation_builder(type1, type2, build_relation)
+
+    def register_bulk_relation_builder(self, type1, type2, build_relations: Callable) -> None:
+        self.builders.register_bulk_relation_builder(type1, type2, build_relations)
+
+    def compile(self, workers: Optional[int] = None, lazy: bool = False) -> AGraphResult:
+        return self.compile_template().instantiate(workers, lazy)
+
+    async def acompile(self, concurrency: int = ASYNC_CONCURRENCY) -> AGraphResult:
+        return await self.compile_template().ainstantiate(concurrency)
+
+    def iter_edges(self, lines: Iterable[str]) -> Iterator[List]:
+        # Nodes and relations are built as the diagram's edges are found. Only nodes of not yet found edges are kept,
+        # bulk builders get one node or pair of nodes at a time.
+        relation_dispatch = self.builders.relation_dispatch()
+        resolve_node = self.__node_resolver()
+        built_nodes: Dict[int, object] = {} # node occurrence => node
+        for occurrences in iter_topology_edges(lines):
+            nodes = []
+            for occurrence in occurrences:
+                if occurrence.index in built_nodes:
+                    node = built_nodes.pop(occurrence.index) if occurrence.last else built_nodes[occurrence.index]
+                else:
+                    resolution = resolve_node(occurrence.id)
+                    node = resolution.build() if resolution is not None else None
+                    if not occurrence.last:
+                        built_nodes[occurrence.index] = node
+                nodes.append(node)
+            relation_builder = relation_dispatch.find(type(nodes[0]), type(nodes[1]))
+            if relation_builder is not None:
+                build_relation, reversed_nodes = relation_builder
+                node1, node2 = nodes[::-1] if reversed_nodes else nodes
+                if isinstance(build_relation, BulkRelationBuilder):
+                    build_relation.build_relations([(node1, node2)])
                 else:
-                    connected_cell_cords = e[1]
-                # remove edge from matrix
-                matrix[connected_cell.row][connected_cell.col] = None
-                connected_cell = connected_cell_cords
-            nodes[i] = self.__get_node(id=matrix[connected_cell.row][connected_cell.col].id) # TODO Improve handling Node instance
-
-        self.__build_relation(nodes[0], nodes[1])
-        return nodes # list of connected nodes
-
-    def __build_class_registry(self) -> None:
-        self.__class_registry = {}
-        for module_id in list(sys.modules):
-            try:
-                module = sys.modules[module_id]
-                if inspect.ismodule(module):
-                    members = inspect.getmembers(module, inspect.isclass) # [(member_name, member_value), (member_name, member_value), ...]
-                    for member in members:
-                        self.__class_registry[member[0]] = member[1]
-            except ModuleNotFoundError:
-                continue
-
-    def __get_node(self, id: str) -> object:
-        # Try from registered nodes
-        if id in self.model.nodes:
-            return self.model.nodes[id]
-        # Try from registered node builders
-        type_candidates = sorted(filter(lambda type_with_defined_builder: id.startswith(type_with_defined_builder), list(self.node_builders)), key=len)
-        if type_candidates is not None and len(type_candidates) > 0:
-            top_priority_candidate = type_candidates.pop()
-            if len(top_priority_candidate) < len(id):
-                id_candidate = id[len(top_priority_candidate):]
-                try:
-                    return self.node_builders[top_priority_candidate](id_candidate) # what about id type str/int?
-                except TypeError:
-                    return self.node_builders[top_priority_candidate]()
+                    build_relation(node1, node2)
+            yield nodes
+
+    def compile_template(self, representation: Optional[str] = None, generate_code: bool = False) -> AGraphTemplate:
+        topology = self.compile_topology(representation)
+        connected_node_indices = {node_index for edge in topology.edges for node_index in edge}
+        resolve_node = self.__node_resolver()
+        node_resolutions = tuple(
+            resolve_node(node_id) if node_index in connected_node_indices else None
+            for node_index, node_id in enumerate(topology.node_ids)
+        )
+        return AGraphTemplate(topology, node_resolutions, self.builders.relation_dispatch(), generate_code)
+
+    def compile_topology(self, representation: Optional[str] = None) -> Topology:
+        representation = representation if representation is not None else self.representation
+        topology = self.topology_cache.get(representation)
+        if topology is None:
+            topology = compile_topology(representation, self.backend)
+            self.topology_cache.put(representation, topology)
+        return topology
+
+    def compile_topologies(self, representations: Iterable[str], workers: Optional[int] = None) -> List[Topology]:
+        # Not cached topologies are compiled in worker processes, which get only the representations and the backend
+        representations = list(representations)
+        topologies = [self.topology_cache.get(representation) for representation in representations]
+        missing_representations = list(dict.fromkeys(
+            representation for representation, topology in zip(representations, topologies) if topology is None
+        ))
+        if workers == 1 or len(missing_representations) <= 1:
+            compiled_topologies = [compile_topology(representation, self.backend) for representation in missing_representations]
+        else:
+            chunksize = max(1, len(missing_representations) // (4 * (workers or os.cpu_count() or 1)))
+            with ProcessPoolExecutor(workers) as executor:
+                compiled_topologies = list(executor.map(partial(compile_topology, backend=self.backend), missing_representations, chunksize=chunksize))
+        compiled = dict(zip(missing_representations, compiled_topologies))
+        for representation, topology in compiled.items():
+            self.topology_cache.put(representation, topology)
+        return [topology if topology is not None else compiled[representation] for representation, topology in zip(representations, topologies)]
+
+    def resolve_node(self, id: str) -> Optional[NodeResolution]:
+        return self.__node_resolver()(id)
+
+    def __node_resolver(self) -> Callable[[str], Optional[NodeResolution]]:
+        # Resolves nodes of one diagram. Loaded modules are checked for new classes at most once, on the first node
+        # auto-detected from the class registry.
+        class_registry_version: Optional[int] = None
+        def resolve_node(id: str) -> Optional[NodeResolution]:
+            nonlocal class_registry_version
+            # Try from registered nodes
+            registered_node = self.model.find_node(id)
+            if registered_node is not None:
+                return NodeResolution.registered(id, registered_node[0])
+            # Try from registered node builders
+            resolution = self.__resolve_node_builder(id)
+            if resolution is not None:
+                return resolution
+            # TODO raise an exception if unable to match type and node OR return None (then it's unknown if something wrong happened)
+            if class_registry_version is None:
+                class_registry.refresh()
+                class_registry_version = class_registry.version
+            return self.__resolve_node_class(id, class_registry_version)
+        return resolve_node
+
+    def __resolve_node_builder(self, id: str) -> Optional[NodeResolution]:
+        builders_version = self.builders.version
+        if builders_version != self.__node_resolutions_builders_version:
+            self.node_resolutions.clear()
+            self.__node_resolutions_builders_version = builders_version
+        resolution = self.node_resolutions.get(id, NOT_RESOLVED)
+        if resolution is NOT_RESOLVED:
+            type_candidate = self.builders.node_builder(id)
+            if type_candidate is not None:
+                type_name, build_node = type_candidate
+                node_type = self.builders.node_type(type_name)
+                if isinstance(build_node, BulkNodeBuilder):
+                    resolution = NodeResolution.resolve_bulk(id, type_name, build_node.build_nodes, node_type)
+                else:
+                    resolution = NodeResolution.resolve(id, type_name, build_node, node_type)
             else:
-                return self.node_builders[top_priority_candidate]()
+                resolution = None
+            self.node_resolutions.put(id, resolution)
+        return resolution
 
+    @staticmethod
+    def __resolve_node_class(id: str, class_registry_version: int) -> Optional[NodeResolution]:
         # Try to new object with id -> Try to match the prefix to a type (skipping more and more last characters?)
         # TODO Is it ok to expect some separator like '_' between type and id? - makes the node id longer
-        type_candidates = sorted(filter(lambda type: id.startswith(type), list(self.__class_registry)), key=len)
-        if type_candidates is not None and len(type_candidates) > 0:
-            top_priority_candidate = type_candidates.pop()
-            ambigious_candidates = list(filter(lambda candidate: len(candidate) == len(top_priority_candidate), type_candidates))
-            if not bool(ambigious_candidates):
-                if len(top_priority_candidate) < len(id):
-                    id_candidate = id[len(top_priority_candidate):]
-                    try:
-                        return self.__class_registry[top_priority_candidate](id_candidate) # what about id type str/int?
-                    except TypeError:
-                        return self.__class_registry[top_priority_candidate]()
-                else:
-                    return self.__class_registry[top_priority_candidate]()
-        # Try to new object
-        # TODO raise an exception if unable to match type and node OR return None (then it's unknown if something wrong happened)
-
-    # TODO The "reverse type recipe match" should be done when the direction of relation doesn't matter (not directed edge)
-    # TODO The "recipe matching" should raise error if recipe depend on direction but edge is declared not directional
-    def __build_relation(self, node1, node2) -> None:
-        node1_type = type(node1)
-        node2_type = type(node2)
-        if node1_type in self.relation_builders and node2_type in self.relation_builders[node1_type]:
-            self.relation_builders[node1_type][node2_type](node1, node2)
-        elif node2_type in self.relation_builders and node1_type in self.relation_builders[node2_type]:
-            self.relation_builders[node2_type][node1_type](node2, node1)
-
-    def __split_representation_lines(self, representation: str) -> List[List]:
-        lines = representation.splitlines()
-        if len(lines[0]) is 0 or lines[0].isspace():
-            del lines[0]
-        if len(lines[-1]) is 0 or lines[-1].isspace():
-            del lines[-1]
-        return lines
-
-    def __separate_identifiers(self, line: str) -> List[str]:
-        line_copy = []
-        for character in line:
-            if EdgeFactory.make_edge(character) is not None:
-                character = ' '
-            line_copy.append(character)
-        return ''.join(line_copy).split() # ['N1', 'N12'] - with repeats, keeping order
+        resolution = class_resolutions.get((id, class_registry_version), NOT_RESOLVED)
+        if resolution is NOT_RESOLVED:
+            type_candidate = class_registry.longest_prefix(id, refresh=False)
+            resolution = NodeResolution.resolve(id, *type_candidate, type_candidate[1]) if type_candidate is not None else None
+            class_resolutions.put((id, class_registry_version), resolution)
+        return resolution
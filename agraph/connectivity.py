@@ -0,0 +1,101 @@
+from typing import Dict, List, Optional, Tuple
+
+from agraph.edge import EDGES_BY_KIND, AsteriskConnector
+from agraph.grid import EMPTY, NODE, Grid
+
+
+class DisjointSet:
+    def __init__(self, size: int):
+        self.parents: List[int] = list(range(size))
+
+    def find(self, element: int) -> int:
+        parents = self.parents
+        while parents[element] != element:
+            parents[element] = parents[parents[element]] # path halving
+            element = parents[element]
+        return element
+
+    def union(self, element1: int, element2: int) -> None:
+        root1, root2 = self.find(element1), self.find(element2)
+        if root1 != root2:
+            # Keep the lower (earlier discovered) element as a root
+            self.parents[max(root1, root2)] = min(root1, root2)
+
+def resolve_edges(grid: Grid, edge_starts: List[int]) -> List[Tuple[int, int]]:
+    # Edge elements are straight runs of one edge character and connectors, given by their first cells column by column.
+    # Runs are joined with the connectors at their ends, each resulting component is one edge. It's oriented as if
+    # it was followed from its first element: the node reached through first element's first connected cell goes first.
+    # 'N0-*-N1' => [(0, 1)]
+    kinds = grid.kinds
+    element_count = len(edge_starts)
+    connector_elements: Dict[int, int] = {cell: element for element, cell in enumerate(edge_starts) if kinds[cell] == AsteriskConnector.kind}
+    run_end_elements: Dict[int, int] = {} # first and last cells of runs => element
+    links: List[Tuple[int, int]] = [] # (run element, connector element)
+    run_sides: Dict[int, List[Optional[int]]] = {} # run element => connector element on each side
+    endpoints: List[Tuple[int, int, int]] = [] # (element, side, node index)
+    connections: Dict[int, List[int]] = {} # connector element => connected run cells
+
+    for element, cell in enumerate(edge_starts):
+        edge = EDGES_BY_KIND[kinds[cell]]
+        if edge.run_offset is None:
+            connections[element] = edge.connected_cells(grid, cell)
+            if len(connections[element]) != 2:
+                raise ValueError(f'Connector at {_position(grid, cell)} joins {len(connections[element])} edges, 2 expected')
+            continue
+        previous = grid.offset(*edge.run_offset)
+        length = grid.run_length(cell, -previous)
+        last_cell = cell - previous * (length - 1)
+        run_end_elements[cell] = run_end_elements[last_cell] = element
+        # Cells beyond run's first and last cells, in the order of edge's connected cells
+        ends = (cell + previous, last_cell - previous)
+        if edge.run_offset != edge.offsets[0]:
+            ends = ends[::-1]
+        for side, end in enumerate(ends):
+            end_kind = kinds[end]
+            if end_kind == NODE:
+                endpoints.append((element, side, grid.nodes[end]))
+            elif end_kind == AsteriskConnector.kind:
+                links.append((element, connector_elements[end]))
+                run_sides.setdefault(element, [None, None])[side] = connector_elements[end]
+            elif end_kind == EMPTY:
+                raise ValueError(f'Edge ends without a node at {_position(grid, end)}')
+            else:
+                raise ValueError(f'Edge characters are joined without a connector at {_position(grid, end)}')
+
+    components = DisjointSet(element_count)
+    for element, connector_element in links:
+        components.union(element, connector_element)
+    component_endpoints: Dict[int, List[Tuple[int, int, int]]] = {}
+    for endpoint in endpoints:
+        component_endpoints.setdefault(components.find(endpoint[0]), []).append(endpoint)
+
+    # Components split at their first elements tell which endpoint lays on which side of the first element
+    first_elements = {components.find(element) for element in range(element_count)}
+    sides = DisjointSet(element_count)
+    for element, connector_element in links:
+        if element not in first_elements and connector_element not in first_elements:
+            sides.union(element, connector_element)
+
+    edges = []
+    for first_element in sorted(first_elements):
+        first_endpoints = component_endpoints.get(first_element, [])
+        if len(first_endpoints) != 2:
+            raise ValueError(f'Edge at {_position(grid, edge_starts[first_element])} does not connect two nodes')
+        if first_element in connections:
+            side_elements = [run_end_elements[cell] for cell in connections[first_element]]
+        else:
+            side_elements = run_sides.get(first_element, [None, None])
+        nodes = [None, None]
+        for element, side, node_index in first_endpoints:
+            if element == first_element:
+                nodes[side] = node_index
+            elif side_elements[0] is not None and sides.find(element) == sides.find(side_elements[0]):
+                nodes[0] = node_index
+            else:
+                nodes[1] = node_index
+        edges.append((nodes[0], nodes[1]))
+    return edges
+
+def _position(grid: Grid, index: int) -> str:
+    row, col = grid.point(index)
+    return f'line {row + 1}, column {col + 1}'
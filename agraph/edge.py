@@ -1,87 +1,80 @@
-from itertools import product
-from typing import Callable, List, Set
+from typing import List, Optional, Tuple
 
-from agraph.point import Point
+from agraph.grid import Grid
 
 
+# Edges are stateless flyweights - one instance per edge character, looked up by kind code or character
 class Edge:
-    @staticmethod
-    def applicable(character: str):
-        return False
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        raise NotImplementedError()
+    character: str = None
+    kind: int = None
+    offsets: Tuple[Tuple[int, int], ...] = () # (row, col) offsets of connected cells
+    run_offset: Optional[Tuple[int, int]] = None # (row, col) offset of the previous cell of a straight run, column by column
+    @classmethod
+    def applicable(cls, character: str):
+        return character == cls.character
+    def connected_cells(self, grid: Grid, edge_index: int) -> List[int]:
+        return [edge_index + grid.offset(*offset) for offset in self.offsets]
     def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
-        raise NotImplementedError()
+        return (target_row - edge_row, target_col - edge_col) in self.offsets
 
 class VerticalEdge(Edge):
-    @staticmethod
-    def applicable(character: str):
-        return character == r'|'
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        return [
-            Point(row=edge_row_index-1, col=edge_column_index),
-            Point(row=edge_row_index+1, col=edge_column_index)]
-    def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
-        return edge_col is target_col and abs(target_row - edge_row) is 1
+    character = r'|'
+    kind = 2
+    offsets = ((-1, 0), (1, 0))
+    run_offset = (-1, 0)
 
 class HorizontalEdge(Edge):
-    @staticmethod
-    def applicable(character: str):
-        return character == r'-'
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        return [
-            Point(row=edge_row_index, col=edge_column_index-1),
-            Point(row=edge_row_index, col=edge_column_index+1)]
-    def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
-        return edge_row is target_row and abs(target_col - edge_col) is 1
+    character = r'-'
+    kind = 3
+    offsets = ((0, -1), (0, 1))
+    run_offset = (0, -1)
 
 class BackslashEdge(Edge):
-    @staticmethod
-    def applicable(character: str):
-        return character == '\\'
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        return [
-            Point(row=edge_row_index-1, col=edge_column_index-1),
-            Point(row=edge_row_index+1, col=edge_column_index+1)]
-    def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
-        return (target_row - edge_row) * (target_col - edge_col) is 1
+    character = '\\'
+    kind = 4
+    offsets = ((-1, -1), (1, 1))
+    run_offset = (-1, -1)
 
 class ForwardslashEdge(Edge):
-    @staticmethod
-    def applicable(character: str):
-        return character == r'/'
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        return [
-            Point(row=edge_row_index-1, col=edge_column_index+1),
-            Point(row=edge_row_index+1, col=edge_column_index-1)]
-    def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
-        return (target_row - edge_row) * (target_col - edge_col) is -1
+    character = r'/'
+    kind = 5
+    offsets = ((-1, 1), (1, -1))
+    run_offset = (1, -1)
 
 class AsteriskConnector(Edge):
-    @staticmethod
-    def applicable(character: str):
-        return character == r'*'
-    def connected_cells(self, matrix, edge_row_index, edge_column_index) -> List[Point]:
-        return self.__neighbour_edges_cords(matrix, edge_row_index, edge_column_index)
-    def __neighbour_edges_cords(self, matrix: List[List[str]], center_row_index: int, center_column_index: int) -> List[Point]:
-        points: List[Point] = []
-        for row, col in product(range(max(center_row_index-1, 0), center_row_index+2), range(max(center_column_index-1, 0), center_column_index+2)):
-            if row is center_row_index and col is center_column_index:
-                continue
-            try:
-                if isinstance(matrix[row][col], Edge) and matrix[row][col].connects(row, col, center_row_index, center_column_index):
-                    points.append(Point(row=row, col=col))
-            except IndexError:
-                continue
-        return points
+    character = r'*'
+    kind = 6
+    NEIGHBOURS: Tuple[Tuple[int, int], ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+    def connected_cells(self, grid: Grid, edge_index: int) -> List[int]:
+        # Neighbour edges pointing at the connector, in row by row order
+        kinds = grid.kinds
+        cells = []
+        for row_offset, col_offset in self.NEIGHBOURS:
+            index = edge_index + grid.offset(row_offset, col_offset)
+            if kinds[index] in CONNECTING_KINDS[row_offset, col_offset]:
+                cells.append(index)
+        return cells
     def connects(self, edge_row: int, edge_col: int, target_row: int, target_col) -> bool:
         return False
 
+EDGES: Tuple[Edge, ...] = (VerticalEdge(), HorizontalEdge(), BackslashEdge(), ForwardslashEdge(), AsteriskConnector())
+
+EDGES_BY_KIND: List[Optional[Edge]] = [None] * 256
+EDGES_BY_CHARACTER: List[Optional[Edge]] = [None] * 256 # indexed with ord(character)
+for edge in EDGES:
+    EDGES_BY_KIND[edge.kind] = edge
+    EDGES_BY_CHARACTER[ord(edge.character)] = edge
+
+# Kinds of edges which connect to a cell when placed at given (row, col) offset from it
+CONNECTING_KINDS = {
+    (row_offset, col_offset): frozenset(edge.kind for edge in EDGES if edge.connects(row_offset, col_offset, 0, 0))
+    for row_offset, col_offset in AsteriskConnector.NEIGHBOURS
+}
+
 class EdgeFactory:
-    AVAILABLE_EDGES: Set[Edge] = set([VerticalEdge, HorizontalEdge, BackslashEdge, ForwardslashEdge, AsteriskConnector])
+    AVAILABLE_EDGES: Tuple[Edge, ...] = EDGES
     @staticmethod
-    def make_edge(edge_character: str):
-        try:
-            return next(filter(lambda edge: edge.applicable(edge_character), EdgeFactory.AVAILABLE_EDGES))()
-        except Exception:
-            return None
+    def make_edge(edge_character: str) -> Optional[Edge]:
+        # None for anything but an edge character
+        code = ord(edge_character) if isinstance(edge_character, str) and len(edge_character) == 1 else 256
+        return EDGES_BY_CHARACTER[code] if code < 256 else None
@@ -0,0 +1,62 @@
+from array import array
+from typing import List, Optional
+
+from agraph.point import Point
+
+
+# Cell kinds, edge kinds follow (see agraph.edge)
+EMPTY = 0
+NODE = 1
+
+class Grid:
+    # Cells are stored row by row in flat arrays. The grid is padded with an empty row above and below
+    # and an empty column after each row, so every neighbour of a representation cell is a valid index.
+    def __init__(self, width: int, height: int):
+        self.width: int = width + 1
+        self.height: int = height + 2
+        self.kinds: bytearray = bytearray(self.width * self.height) # cell kind codes
+        self.nodes: array = array('i', [-1]) * (self.width * self.height) # index of node occupying the cell
+        self.node_ids: List[str] = []
+
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.width + col
+
+    def point(self, index: int) -> Point:
+        row, col = divmod(index, self.width)
+        return Point(row=row - 1, col=col)
+
+    def offset(self, row_offset: int, col_offset: int) -> int:
+        return row_offset * self.width + col_offset
+
+    def add_node(self, id: str, row: int, start_col: int) -> int:
+        node_index = len(self.node_ids)
+        self.node_ids.append(id)
+        start = self.index(row, start_col)
+        end = start + len(id)
+        self.kinds[start:end] = bytes([NODE]) * len(id)
+        self.nodes[start:end] = array('i', [node_index]) * len(id)
+        return node_index
+
+    def add_edges(self, row: int, start_col: int, kinds: bytes) -> range:
+        start = self.index(row, start_col)
+        self.kinds[start:start + len(kinds)] = kinds
+        return range(start, start + len(kinds))
+
+    def run_length(self, start: int, step: int) -> int:
+        # Number of consecutive cells of the start cell's kind, going from start by step
+        kind = self.kinds[start:start + 1]
+        limit = 16
+        while True:
+            cells = self.kinds[start:self.__slice_stop(start + step * limit):step]
+            length = len(cells) - len(cells.lstrip(kind))
+            if length < len(cells) or len(cells) < limit:
+                return length
+            limit *= 4
+
+    def __slice_stop(self, stop: int) -> Optional[int]:
+        # Only the upper left neighbour of the first representation cell lays before the grid
+        return stop if stop >= 0 else None
+
+    def column_major_key(self, index: int) -> int:
+        row, col = divmod(index, self.width)
+        return col * self.height + row
@@ -0,0 +1,129 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from agraph.bands import Band, merge_bands, resolve_band
+from agraph.topology import Topology, split_representation_lines
+
+
+INCREMENTAL_BAND_ROWS = 32 # the least lines resolved again around an edited line
+
+class TopologyDelta(NamedTuple):
+    # Changes since the previous version of a diagram. Node occurrences on unchanged lines are kept (possibly with other
+    # indices), the ones on edited lines are removed and added.
+    topology: Topology # of the new version
+    kept_nodes: Dict[int, int] # previous node index => node index
+    removed_nodes: Tuple[int, ...] # previous node indices
+    added_nodes: Tuple[int, ...]
+    removed_edges: Tuple[Tuple[int, int], ...] # pairs of previous node indices
+    added_edges: Tuple[Tuple[int, int], ...]
+
+class IncrementalTopology:
+    # Topology of a diagram edited over time, kept as bands of lines. Bands whose lines and the lines around them are
+    # unchanged in a new version are reused, only the edited lines are resolved again.
+    def __init__(self, band_rows: int = INCREMENTAL_BAND_ROWS):
+        self.band_rows = band_rows
+        self.lines: List[str] = []
+        self.bands: List[Tuple[int, Band]] = [] # (first row, band)
+        self.topology = Topology((), ())
+        self.resolved_lines = 0 # by the last update
+
+    def update(self, representation: str) -> TopologyDelta:
+        lines = split_representation_lines(representation)
+        line_mapping = self.__line_mapping(lines)
+        bands: List[Tuple[int, Band]] = []
+        resolved_lines = 0
+        row = 0
+        for first_row, band in self.__reusable_bands(lines, line_mapping) + [(len(lines), None)]:
+            # Lines between reused bands
+            for start in range(row, first_row, self.band_rows):
+                end = min(start + self.band_rows, first_row)
+                previous_line = lines[start - 1] if start > 0 else None
+                next_line = lines[end] if end < len(lines) else None
+                bands.append((start, resolve_band(previous_line, lines[start:end], next_line, start)))
+                resolved_lines += end - start
+            if band is not None:
+                bands.append((first_row, band))
+                row = first_row + len(band.line_node_counts)
+        topology = merge_bands([band for _, band in bands], [first_row for first_row, _ in bands])
+
+        kept_nodes = self.__kept_nodes(line_mapping, bands)
+        delta = TopologyDelta(
+            topology, kept_nodes,
+            tuple(node_index for node_index in range(len(self.topology.node_ids)) if node_index not in kept_nodes),
+            tuple(sorted(set(range(len(topology.node_ids))).difference(kept_nodes.values()))),
+            *self.__edges_delta(topology, kept_nodes)
+        )
+        self.lines, self.bands, self.topology, self.resolved_lines = lines, bands, topology, resolved_lines
+        return delta
+
+    def __line_mapping(self, lines: List[str]) -> List[Optional[int]]:
+        # Previous line => the same, unchanged line of the new version. Common first and last lines are matched before
+        # the (much slower) diff of the lines between them.
+        previous_lines = self.lines
+        prefix = 0
+        while prefix < min(len(previous_lines), len(lines)) and previous_lines[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < min(len(previous_lines), len(lines)) - prefix and previous_lines[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+        line_mapping: List[Optional[int]] = [None] * len(previous_lines)
+        line_mapping[:prefix] = range(prefix)
+        line_mapping[len(previous_lines) - suffix:] = range(len(lines) - suffix, len(lines))
+        matcher = SequenceMatcher(None, previous_lines[prefix:len(previous_lines) - suffix], lines[prefix:len(lines) - suffix])
+        for previous_start, start, size in matcher.get_matching_blocks():
+            line_mapping[prefix + previous_start:prefix + previous_start + size] = range(prefix + start, prefix + start + size)
+        return line_mapping
+
+    def __reusable_bands(self, lines: List[str], line_mapping: List[Optional[int]]) -> List[Tuple[int, Optional[Band]]]:
+        # Bands resolved from the same lines, between the same lines, at their new first rows
+        reusable_bands = []
+        for previous_first_row, band in self.bands:
+            first_row = line_mapping[previous_first_row]
+            previous_end = previous_first_row + len(band.line_node_counts)
+            if first_row is None or (previous_first_row == 0) != (first_row == 0):
+                continue
+            if (previous_end == len(self.lines)) != (first_row + previous_end - previous_first_row == len(lines)):
+                continue
+            if all(
+                line_mapping[row] == first_row + row - previous_first_row
+                for row in range(max(previous_first_row - 1, 0), min(previous_end + 1, len(self.lines)))
+            ):
+                reusable_bands.append((first_row, band))
+        return reusable_bands
+
+    def __kept_nodes(self, line_mapping: List[Optional[int]], bands: List[Tuple[int, Band]]) -> Dict[int, int]:
+        previous_first_nodes = self.__first_nodes(self.bands)
+        first_nodes = self.__first_nodes(bands)
+        kept_nodes = {}
+        for previous_row, row in enumerate(line_mapping):
+            if row is not None:
+                for offset in range(previous_first_nodes[previous_row + 1] - previous_first_nodes[previous_row]):
+                    kept_nodes[previous_first_nodes[previous_row] + offset] = first_nodes[row] + offset
+        return kept_nodes
+
+    @staticmethod
+    def __first_nodes(bands: List[Tuple[int, Band]]) -> List[int]:
+        # Index of the first node occurrence of each line, and the count of all nodes
+        first_nodes = [0]
+        for _, band in bands:
+            for node_count in band.line_node_counts:
+                first_nodes.append(first_nodes[-1] + node_count)
+        return first_nodes
+
+    def __edges_delta(self, topology: Topology, kept_nodes: Dict[int, int]) -> Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]]:
+        # Edges are compared by their (kept) nodes, parallel edges are counted
+        unmatched_edges = Counter(topology.edges)
+        removed_edges = []
+        for node_index1, node_index2 in self.topology.edges:
+            edge = (kept_nodes.get(node_index1), kept_nodes.get(node_index2))
+            if unmatched_edges[edge] > 0:
+                unmatched_edges[edge] -= 1
+            else:
+                removed_edges.append((node_index1, node_index2))
+        added_edges = []
+        for edge in topology.edges:
+            if unmatched_edges[edge] > 0:
+                unmatched_edges[edge] -= 1
+                added_edges.append(edge)
+        return tuple(removed_edges), tuple(added_edges)
@@ -0,0 +1,144 @@
+from threading import RLock
+from typing import Dict, Iterator, List, Optional
+
+from agraph.connectivity import DisjointSet
+from agraph.node import NodeResolution
+from agraph.result import AGraphResult
+from agraph.template import AGraphTemplate
+
+
+class LazyComponent:
+    # Edges of a template connected with each other (or through a registered node), built together on the first access
+    # to any of their nodes - relations reachable from a built node are never missing
+    def __init__(self, template: AGraphTemplate, edge_indices: List[int]):
+        self.template = template
+        self.edge_indices = edge_indices
+        self.__nodes: Optional[Dict[int, object]] = None # node occurrence => node
+        self.__building = False
+        self.__lock = RLock()
+
+    @property
+    def built(self) -> bool:
+        return self.__nodes is not None
+
+    def node(self, node_index: int) -> object:
+        with self.__lock:
+            if self.__nodes is None:
+                if self.__building:
+                    raise RuntimeError('Lazy node accessed by a builder of its own part of the diagram')
+                self.__building = True
+                try:
+                    part = self.template.part(self.edge_indices)
+                    edges = part.instantiate()
+                finally:
+                    self.__building = False
+                nodes = {}
+                for (node_index1, node_index2), (node1, node2) in zip(part.topology.edges, edges):
+                    nodes[node_index1], nodes[node_index2] = node1, node2
+                self.__nodes = nodes
+            return self.__nodes[node_index]
+
+class LazyNode:
+    # Stands for a node until it is used (its attributes, truth value or items), then the node is built with all nodes
+    # connected to it
+    __slots__ = ('_LazyNode__component', '_LazyNode__node_index')
+
+    def __init__(self, component: LazyComponent, node_index: int):
+        object.__setattr__(self, '_LazyNode__component', component)
+        object.__setattr__(self, '_LazyNode__node_index', node_index)
+
+    @staticmethod
+    def materialized(node: object) -> object:
+        # The built node of a lazy node, other objects as they are
+        if type(node) is LazyNode:
+            return node.__component.node(node.__node_index)
+        return node
+
+    @staticmethod
+    def is_built(node: object) -> bool:
+        return type(node) is not LazyNode or node.__component.built
+
+    @property
+    def __class__(self) -> type:
+        # isinstance works with node's type, the registered one until the node is built - checking it builds nothing
+        node_type = self.__component.template.node_resolutions[self.__node_index].node_type
+        if node_type is None or self.__component.built:
+            return type(LazyNode.materialized(self))
+        return node_type
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(LazyNode.materialized(self), name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        setattr(LazyNode.materialized(self), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(LazyNode.materialized(self), name)
+
+    def __bool__(self) -> bool:
+        return bool(LazyNode.materialized(self))
+
+    def __len__(self) -> int:
+        return len(LazyNode.materialized(self))
+
+    def __iter__(self) -> Iterator:
+        return iter(LazyNode.materialized(self))
+
+    def __getitem__(self, key: object) -> object:
+        return LazyNode.materialized(self)[key]
+
+    def __setitem__(self, key: object, value: object) -> None:
+        LazyNode.materialized(self)[key] = value
+
+    def __delitem__(self, key: object) -> None:
+        del LazyNode.materialized(self)[key]
+
+    def __contains__(self, item: object) -> bool:
+        return item in LazyNode.materialized(self)
+
+    def __eq__(self, other: object) -> bool:
+        return LazyNode.materialized(self) == LazyNode.materialized(other)
+
+    def __hash__(self) -> int:
+        return hash(LazyNode.materialized(self))
+
+    def __str__(self) -> str:
+        return str(LazyNode.materialized(self))
+
+    def __repr__(self) -> str:
+        if not self.__component.built:
+            return f'<lazy {self.__component.template.topology.node_ids[self.__node_index]}>'
+        return repr(LazyNode.materialized(self))
+
+def _is_none(resolution: Optional[NodeResolution]) -> bool:
+    return resolution is None or resolution.is_registered() and resolution.args[0] is None
+
+def instantiate_lazily(template: AGraphTemplate) -> AGraphResult:
+    # A lazy node per node occurrence, or per registered node wherever it occurs. Not resolved nodes and nodes registered
+    # as None stay None.
+    topology, node_resolutions = template.topology, template.node_resolutions
+    components = DisjointSet(len(topology.node_ids))
+    registered_node_indices: Dict[int, int] = {} # registered node's identity => its first occurrence
+    for node_index1, node_index2 in topology.edges:
+        components.union(node_index1, node_index2)
+        for node_index in (node_index1, node_index2):
+            resolution = node_resolutions[node_index]
+            if not _is_none(resolution) and resolution.is_registered():
+                components.union(node_index, registered_node_indices.setdefault(id(resolution.args[0]), node_index))
+
+    edge_indices: Dict[int, List[int]] = {} # component's root => its edges
+    for edge_index, (node_index1, _) in enumerate(topology.edges):
+        edge_indices.setdefault(components.find(node_index1), []).append(edge_index)
+    lazy_components = {root: LazyComponent(template, component_edge_indices) for root, component_edge_indices in edge_indices.items()}
+    lazy_nodes: Dict[int, Optional[LazyNode]] = {} # by node occurrence, the first one of a registered node
+    edges = []
+    for edge in topology.edges:
+        nodes = []
+        for node_index in edge:
+            resolution = node_resolutions[node_index]
+            key = registered_node_indices[id(resolution.args[0])] if not _is_none(resolution) and resolution.is_registered() else node_index
+            if key not in lazy_nodes:
+                lazy_nodes[key] = LazyNode(lazy_components[components.find(node_index)], node_index) if not _is_none(resolution) else None
+            nodes.append(lazy_nodes[key])
+        edges.append(nodes)
+    return AGraphResult(topology, edges)
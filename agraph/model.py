@@ -1,7 +1,24 @@
-from typing import Dict
+from threading import Lock
+from typing import Dict, Optional, Tuple
 
 class AGraphModel:
-    nodes: Dict[str, object] = {}
+    # Registered nodes. Nodes of the shared model underneath are used too, the ones registered here take precedence.
+    def __init__(self, shared: Optional['AGraphModel'] = None):
+        self.nodes: Dict[str, object] = {}
+        self.shared = shared
+        self.__lock = Lock()
 
     def register_node(self, id: str, node: object) -> None:
-        self.nodes[id] = node
+        with self.__lock:
+            self.nodes[id] = node
+
+    def find_node(self, id: str) -> Optional[Tuple[object]]:
+        # (node,) - registered node can be None
+        with self.__lock:
+            if id in self.nodes:
+                return (self.nodes[id],)
+        return self.shared.find_node(id) if self.shared is not None else None
+
+
+# Opt-in nodes visible to all compilers created with the shared model
+shared_model = AGraphModel()
@@ -1,3 +1,63 @@
-class Node:
-    def __init__(self, id: str):
-        self.id = id
+import inspect
+
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class NodeResolution(NamedTuple):
+    # 'Company12' => NodeResolution('Company', <Company builder>, ('12',))
+    type_name: str
+    build_node: Callable
+    args: Tuple[str, ...] = ()
+    bulk: bool = False # build_node builds all nodes of the type at once, from the list of their args
+    node_type: Optional[type] = None # type of the built node, as registered
+
+    @staticmethod
+    def resolve_bulk(id: str, type_name: str, build_nodes: Callable, node_type: Optional[type] = None) -> 'NodeResolution':
+        # 'Company12' => NodeResolution('Company', <Company bulk builder>, ('12',), True), 'Company' => (..., ('',), True)
+        return NodeResolution(type_name, build_nodes, (id[len(type_name):],), True, node_type)
+
+    @staticmethod
+    def resolve(id: str, type_name: str, build_node: Callable, node_type: Optional[type] = None) -> 'NodeResolution':
+        if len(type_name) < len(id):
+            id_candidate = id[len(type_name):]
+            if NodeResolution.__accepts_argument(build_node, id_candidate):
+                return NodeResolution(type_name, build_node, (id_candidate,), node_type=node_type) # what about id type str/int?
+        return NodeResolution(type_name, build_node, node_type=node_type)
+
+    @staticmethod
+    def registered(id: str, node: object) -> 'NodeResolution':
+        return NodeResolution(id, NodeResolution.__registered_node, (node,), node_type=type(node))
+
+    @staticmethod
+    def __registered_node(node: object) -> object:
+        return node
+
+    def is_registered(self) -> bool:
+        return self.build_node is NodeResolution.__registered_node
+
+    @staticmethod
+    def __accepts_argument(build_node: Callable, argument: str) -> bool:
+        try:
+            inspect.signature(build_node).bind(argument)
+        except TypeError:
+            return False
+        except ValueError:
+            pass # No signature available (some builtins) - let the call decide
+        return True
+
+    def build(self) -> object:
+        if self.bulk:
+            return build_bulk_nodes(self.type_name, self.build_node, [self.args[0]])[0]
+        return self.build_node(*self.args)
+
+class BulkNodeBuilder(NamedTuple):
+    build_nodes: Callable
+
+def build_bulk_nodes(type_name: str, build_nodes: Callable, args: List[str]) -> List[object]:
+    return check_bulk_nodes(type_name, build_nodes(args), args)
+
+def check_bulk_nodes(type_name: str, nodes: Iterable, args: List[str]) -> List[object]:
+    nodes = list(nodes)
+    if len(nodes) != len(args):
+        raise ValueError(f'Bulk node builder of {type_name} returned {len(nodes)} nodes for {len(args)} ids')
+    return nodes
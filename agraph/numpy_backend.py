@@ -0,0 +1,56 @@
+from array import array
+from typing import List, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from agraph.edge import EDGES
+from agraph.grid import EMPTY, NODE, Grid
+
+
+def available() -> bool:
+    return numpy is not None
+
+if numpy is not None:
+    # Kind of cell by character code, codes above 255 are looked up as 255 (a node character)
+    KIND_LOOKUP = numpy.array([NODE if not chr(code).isspace() else EMPTY for code in range(256)], dtype=numpy.uint8)
+    for edge in EDGES:
+        KIND_LOOKUP[ord(edge.character)] = edge.kind
+    WIDE_SPACES = numpy.array([code for code in range(256, 0x3001) if chr(code).isspace()], dtype=numpy.uint32)
+
+def parse(lines: List[str]) -> Tuple[Grid, List[int]]:
+    # Same result as agraph.parser.parse computed with array operations
+    grid = Grid(width=max(map(len, lines)), height=len(lines))
+    width, height = grid.width, grid.height
+    padding_row = ' ' * width
+    text = padding_row + ''.join(line.ljust(width) for line in lines) + padding_row
+    codes = numpy.frombuffer(text.encode('utf-32-le'), dtype=numpy.uint32)
+
+    kinds = KIND_LOOKUP[numpy.minimum(codes, 255)]
+    wide = codes > 255
+    if wide.any():
+        kinds[wide & numpy.isin(codes, WIDE_SPACES)] = EMPTY
+
+    # Node spans - every row ends with an empty padding cell, so spans never continue on the next row
+    node_cells = kinds == NODE
+    node_starts = node_cells.copy()
+    node_starts[1:] &= ~node_cells[:-1]
+    node_ends = node_cells.copy()
+    node_ends[:-1] &= ~node_cells[1:]
+    node_indices = numpy.where(node_cells, numpy.cumsum(node_starts, dtype=numpy.intc) - 1, -1).astype(numpy.intc)
+    grid.node_ids = [text[start:end] for start, end in zip(numpy.flatnonzero(node_starts).tolist(), (numpy.flatnonzero(node_ends) + 1).tolist())]
+
+    # Edge run starts - cells which don't continue a straight run of the same character, column by column
+    kinds_2d = kinds.reshape(height, width)
+    run_starts = kinds_2d > NODE
+    for edge in EDGES:
+        if edge.run_offset is not None:
+            previous = numpy.roll(kinds_2d, shift=(-edge.run_offset[0], -edge.run_offset[1]), axis=(0, 1))
+            run_starts &= ~((kinds_2d == edge.kind) & (previous == edge.kind))
+    cols, rows = numpy.nonzero(run_starts.T)
+
+    grid.kinds = bytearray(kinds.tobytes())
+    grid.nodes = array('i', node_indices.tobytes())
+    return grid, (rows * width + cols).tolist()
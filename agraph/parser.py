@@ -0,0 +1,28 @@
+from typing import List, Tuple
+
+from agraph.edge import EDGES_BY_KIND
+from agraph.grid import Grid
+from agraph.tokenizer import NODE_TOKEN, tokenize
+
+
+def parse(lines: List[str]) -> Tuple[Grid, List[int]]:
+    grid = Grid(width=max(map(len, lines)), height=len(lines))
+    edge_cells: List[int] = []
+    for row, line in enumerate(lines):
+        # 'N1 N12' => [NODE, NODE, EMPTY, NODE, NODE, NODE] kinds with [0, 0, -1, 1, 1, 1] node indices
+        for token, value, start_col in tokenize(line):
+            if token == NODE_TOKEN:
+                grid.add_node(value, row, start_col)
+            else:
+                edge_cells.extend(grid.add_edges(row, start_col, value))
+    return grid, edge_run_starts(grid, sorted(edge_cells, key=grid.column_major_key))
+
+def edge_run_starts(grid: Grid, edge_cells: List[int]) -> List[int]:
+    # Cells inside a straight run of one edge character are reached from the run's first cell, so only the first ones
+    # (and connectors) start edge discovery
+    kinds = grid.kinds
+    run_offsets = [grid.offset(*edge.run_offset) if edge is not None and edge.run_offset is not None else None for edge in EDGES_BY_KIND]
+    return [
+        edge_index for edge_index in edge_cells
+        if run_offsets[kinds[edge_index]] is None or kinds[edge_index + run_offsets[kinds[edge_index]]] != kinds[edge_index]
+    ]
@@ -1,5 +1,7 @@
+from typing import NamedTuple
+
+
 # TODO Rename to coordinates - singular form
-class Point:
-    def __init__(self, row: int, col: int):
-        self.row: int = row
-        self.col: int = col
\ No newline at end of file
+class Point(NamedTuple):
+    row: int
+    col: int
@@ -0,0 +1,24 @@
+from typing import Callable, Dict
+
+import pytest
+
+from agraph.agraph import AGraph
+from agraph.snapshot import AGraphSnapshot
+
+
+# Enabled with pytest_plugins = ['agraph.pytest_plugin'] in conftest.py
+
+@pytest.fixture(scope='session')
+def agraph_snapshots() -> Dict[Callable[[], AGraph], AGraphSnapshot]:
+    # Snapshots built in the test session by their AGraph factories
+    return {}
+
+def agraph_fixture(create_agraph: Callable[[], AGraph], scope: str = 'function') -> Callable:
+    # Fixture of a clone of the graph of create_agraph's AGraph, which is built once per session:
+    # company = agraph_fixture(lambda: company_agraph(representation))
+    @pytest.fixture(scope=scope)
+    def fixture(agraph_snapshots: Dict[Callable[[], AGraph], AGraphSnapshot]):
+        if create_agraph not in agraph_snapshots:
+            agraph_snapshots[create_agraph] = create_agraph().build_snapshot()
+        return agraph_snapshots[create_agraph].clone()
+    return fixture
@@ -0,0 +1,82 @@
+import sys, inspect
+
+from threading import RLock
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+
+from agraph.trie import PrefixTrie
+
+
+class ModuleState(NamedTuple):
+    # Module as scanned, it's scanned again once any of the fields changes
+    module: object
+    spec_id: int # reload sets a new spec
+    names_count: int
+    spec: object # kept, so its id isn't reused
+
+    @staticmethod
+    def of(module: object) -> 'ModuleState':
+        spec = getattr(module, '__spec__', None)
+        return ModuleState(module, id(spec), len(getattr(module, '__dict__', ())), spec)
+
+class ClassRegistry:
+    def __init__(self):
+        self.__classes: Dict[str, type] = {}
+        self.__index: PrefixTrie[type] = PrefixTrie()
+        self.__scanned_modules: Dict[str, ModuleState] = {} # sys.modules as of the last scan
+        self.__initializing_module_ids: Set[str] = set() # scanned while being imported
+        self.version = 0 # changes whenever a class name gets bound to a new class
+        self.__lock = RLock()
+
+    def classes(self) -> Dict[str, type]:
+        self.refresh()
+        return self.__classes
+
+    def longest_prefix(self, id: str, refresh: bool = True) -> Optional[Tuple[str, type]]:
+        if refresh:
+            self.refresh()
+        return self.__index.longest_prefix(id)
+
+    def refresh(self) -> None:
+        # Scanned are modules added to or replaced in sys.modules, reloaded or with new names since the last scan. Modules
+        # being imported during a scan may still define some classes, they are scanned again once imported.
+        modules = self.__module_states()
+        if modules == self.__scanned_modules and not self.__initializing_module_ids:
+            return
+        with self.__lock:
+            imported_module_ids = {
+                module_id for module_id in self.__initializing_module_ids
+                if module_id not in modules or not self.__initializing(modules[module_id].module)
+            }
+            self.__initializing_module_ids.difference_update(imported_module_ids)
+            # Keep sys.modules order, so a class name defined in later imported module wins (as with a full scan)
+            for module_id, module_state in modules.items():
+                scanned = self.__scanned_modules.get(module_id) == module_state and module_id not in imported_module_ids
+                if scanned or module_id in self.__initializing_module_ids:
+                    continue
+                self.__scan(module_state.module)
+                if self.__initializing(module_state.module):
+                    self.__initializing_module_ids.add(module_id)
+            self.__scanned_modules = modules
+
+    def __scan(self, module: object) -> None:
+        try:
+            if inspect.ismodule(module):
+                members = inspect.getmembers(module, inspect.isclass) # [(member_name, member_value), (member_name, member_value), ...]
+                for member in members:
+                    if self.__classes.get(member[0]) is not member[1]:
+                        self.__classes[member[0]] = member[1]
+                        self.__index.insert(member[0], member[1])
+                        self.version += 1
+        except (KeyError, ModuleNotFoundError):
+            pass
+
+    @staticmethod
+    def __module_states() -> Dict[str, ModuleState]:
+        return {module_id: ModuleState.of(module) for module_id, module in list(sys.modules.items())}
+
+    @staticmethod
+    def __initializing(module: object) -> bool:
+        return getattr(getattr(module, '__spec__', None), '_initializing', False)
+
+# Scanning sys.modules is expensive, so all compilers share one registry
+class_registry = ClassRegistry()
@@ -0,0 +1,79 @@
+from typing import Dict, Hashable, List, NamedTuple, Optional
+
+from agraph.topology import Topology
+
+
+class CsrAdjacency(NamedTuple):
+    # Neighbours of node i are indices[indptr[i]:indptr[i + 1]], nodes are numbered as in node_ids
+    indptr: 'numpy.ndarray'
+    indices: 'numpy.ndarray'
+    node_ids: 'numpy.ndarray' # id of each node's first occurrence
+
+class AGraphResult(list):
+    # Pairs of connected nodes in order of the diagram's edges, with lookups indexed on the first use. Nodes are told
+    # apart by identity - a registered node is one node wherever it occurs, nodes built for each occurrence of an id
+    # are different nodes.
+    def __init__(self, topology: Topology, edges: List[List]):
+        super().__init__(edges)
+        self.topology = topology
+        self.__nodes: Optional[List[object]] = None
+        self.__node_ids: List[str] = []
+        self.__node_indices: Dict[Hashable, int] = {} # node identity => node index
+        self.__node_indices_by_id: Dict[str, int] = {} # the first node of an id
+        self.__edges: List[int] = [] # node indices of edges' first and second nodes, one edge after another
+        self.__adjacency: List[List[int]] = [] # node index => node index at the other end of each of node's edges
+
+    def node(self, id: str) -> object:
+        # The node of id's first occurrence connected by an edge
+        self.__index()
+        return self.__nodes[self.__node_indices_by_id[id]]
+
+    def nodes(self, type: Optional[type] = None) -> List[object]:
+        self.__index()
+        return [node for node in self.__nodes if type is None or isinstance(node, type)]
+
+    def neighbours(self, node: object, type: Optional[type] = None) -> List[object]:
+        # Nodes connected to the node, each once, in order of edges
+        self.__index()
+        neighbour_indices = dict.fromkeys(self.__adjacency[self.__node_indices[id(node)]])
+        return [self.__nodes[index] for index in neighbour_indices if type is None or isinstance(self.__nodes[index], type)]
+
+    def degree(self, node: object) -> int:
+        # Edges of the node, a loop counts twice
+        self.__index()
+        return len(self.__adjacency[self.__node_indices[id(node)]])
+
+    def to_csr(self, directed: bool = False) -> CsrAdjacency:
+        # Undirected adjacency lists both ends of each edge, directed one only the edge's first node => second node
+        import numpy # only the export needs it
+        self.__index()
+        edges = numpy.array(self.__edges, dtype=numpy.int64).reshape(-1, 2)
+        if not directed:
+            edges = numpy.stack((edges, edges[:, ::-1]), axis=1).reshape(-1, 2)
+        index_type = numpy.int32 if max(len(self.__nodes), len(edges)) < 2 ** 31 else numpy.int64
+        order = numpy.argsort(edges[:, 0], kind='stable') # neighbours in order of edges
+        indptr = numpy.zeros(len(self.__nodes) + 1, dtype=index_type)
+        numpy.cumsum(numpy.bincount(edges[:, 0], minlength=len(self.__nodes)), out=indptr[1:])
+        return CsrAdjacency(indptr, edges[order, 1].astype(index_type), numpy.array(self.__node_ids, dtype=str))
+
+    def __index(self) -> None:
+        # Built once, the lookups only read it
+        if self.__nodes is not None:
+            return
+        nodes, node_ids, node_indices, node_indices_by_id, edges = [], [], {}, {}, []
+        for built_nodes, edge in zip(self, self.topology.edges):
+            for node, node_index in zip(built_nodes, edge):
+                key = id(node) if node is not None else (None, node_index) # not resolved nodes by their occurrences
+                if key not in node_indices:
+                    node_indices[key] = len(nodes)
+                    node_indices_by_id.setdefault(self.topology.node_ids[node_index], len(nodes))
+                    node_ids.append(self.topology.node_ids[node_index])
+                    nodes.append(node)
+                edges.append(node_indices[key])
+        adjacency = [[] for _ in nodes]
+        for node_index1, node_index2 in zip(edges[::2], edges[1::2]):
+            adjacency[node_index1].append(node_index2)
+            adjacency[node_index2].append(node_index1)
+        self.__node_ids, self.__node_indices, self.__node_indices_by_id = node_ids, node_indices, node_indices_by_id
+        self.__edges, self.__adjacency = edges, adjacency
+        self.__nodes = nodes
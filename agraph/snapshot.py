@@ -0,0 +1,111 @@
+import copy
+import io
+import pickle
+import types
+
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from agraph.result import AGraphResult
+
+
+CloneHooks = Dict[type, Callable[[object], object]] # type => object used in clones instead of an object of the type
+
+ATOMIC_TYPES = (type, types.FunctionType, types.BuiltinFunctionType, types.MethodType, types.ModuleType, str, bytes, int, float, complex, type(None))
+
+def find_clone_hook(clone_hooks: CloneHooks, object_type: type) -> Optional[Callable[[object], object]]:
+    # Hook of the closest type in object's MRO
+    for base_type in object_type.__mro__:
+        if base_type in clone_hooks:
+            return clone_hooks[base_type]
+    return None
+
+class HookedPickler(pickle.Pickler):
+    # Objects with clone hooks are pickled as their indices in hooked_objects
+    def __init__(self, file: BinaryIO, clone_hooks: CloneHooks):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.clone_hooks = clone_hooks
+        self.hooked_objects: List[Tuple[object, Callable[[object], object]]] = []
+        self.__hooked_indices: Dict[int, int] = {} # object's identity => its index
+
+    def persistent_id(self, obj: object) -> Optional[int]:
+        if id(obj) in self.__hooked_indices:
+            return self.__hooked_indices[id(obj)]
+        clone_hook = find_clone_hook(self.clone_hooks, type(obj))
+        if clone_hook is None:
+            return None
+        self.__hooked_indices[id(obj)] = len(self.hooked_objects)
+        self.hooked_objects.append((obj, clone_hook))
+        return self.__hooked_indices[id(obj)]
+
+class HookedUnpickler(pickle.Unpickler):
+    # Hooked objects are replaced by their clone hooks' results, one per object
+    def __init__(self, file: BinaryIO, hooked_objects: List[Tuple[object, Callable[[object], object]]]):
+        super().__init__(file)
+        self.hooked_objects = hooked_objects
+        self.__clones: Dict[int, object] = {}
+
+    def persistent_load(self, index: int) -> object:
+        if index not in self.__clones:
+            hooked_object, clone_hook = self.hooked_objects[index]
+            self.__clones[index] = clone_hook(hooked_object)
+        return self.__clones[index]
+
+class AGraphSnapshot:
+    # Graph built once and then only copied, each clone is one structural copy of all its edges - nodes referenced from
+    # many places (or by each other) stay single objects. The master graph is pickled and never given away, graphs
+    # which can't be pickled (e.g. of local classes) are deep copied instead, which is a few times slower.
+    def __init__(self, graph: AGraphResult, clone_hooks: Optional[CloneHooks] = None):
+        self.__topology = graph.topology
+        self.__clone_hooks = dict(clone_hooks or {})
+        edges = [list(edge) for edge in graph]
+        try:
+            file = io.BytesIO()
+            pickler = HookedPickler(file, self.__clone_hooks)
+            pickler.dump(edges)
+            self.__data: Optional[bytes] = file.getvalue()
+            self.__edges: Optional[List[List]] = None
+            self.__hooked_objects = pickler.hooked_objects
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self.__data, self.__edges = None, edges
+            self.__hooked_objects = self.__find_hooked_objects() # found once, the master graph doesn't change
+
+    def clone(self) -> AGraphResult:
+        if self.__data is not None:
+            edges = HookedUnpickler(io.BytesIO(self.__data), self.__hooked_objects).load()
+        else:
+            # Objects with clone hooks are put to the memo, so the deep copy uses the hooks' results instead of copying them
+            memo = {id(hooked_object): clone_hook(hooked_object) for hooked_object, clone_hook in self.__hooked_objects}
+            edges = copy.deepcopy(self.__edges, memo)
+        return AGraphResult(self.__topology, edges)
+
+    def __find_hooked_objects(self) -> List[Tuple[object, Callable[[object], object]]]:
+        # Walk through objects' attributes and containers, as the deep copy would do
+        if not self.__clone_hooks:
+            return []
+        hooked_objects = []
+        visited = set()
+        pending: List[object] = [self.__edges]
+        while pending:
+            current = pending.pop()
+            if id(current) in visited or isinstance(current, ATOMIC_TYPES):
+                continue
+            visited.add(id(current))
+            clone_hook = find_clone_hook(self.__clone_hooks, type(current))
+            if clone_hook is not None:
+                hooked_objects.append((current, clone_hook))
+                continue
+            if isinstance(current, dict):
+                pending.extend(current.keys())
+                pending.extend(current.values())
+            elif isinstance(current, (list, tuple, set, frozenset)):
+                pending.extend(current)
+            if hasattr(current, '__dict__'):
+                pending.extend(vars(current).values())
+            for base_type in type(current).__mro__:
+                slots = getattr(base_type, '__slots__', ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    if slot.startswith('__') and not slot.endswith('__'):
+                        slot = f'_{base_type.__name__.lstrip("_")}{slot}' # private name
+                    if hasattr(current, slot):
+                        pending.append(getattr(current, slot))
+        return hooked_objects
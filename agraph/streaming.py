@@ -0,0 +1,207 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from agraph.edge import CONNECTING_KINDS, EDGES_BY_KIND, AsteriskConnector
+from agraph.grid import EMPTY, NODE
+from agraph.tokenizer import NODE_TOKEN, tokenize
+
+
+class NodeOccurrence(NamedTuple):
+    index: int # as in Topology.node_ids
+    id: str
+    last: bool # no later edge connects the occurrence
+
+class StreamRow:
+    # One line of a diagram - cell kinds and node occurrences by column
+    def __init__(self, line: str, first_node_index: int):
+        self.kinds = bytearray(len(line))
+        self.nodes: Dict[int, Tuple[int, str]] = {} # column => (node index, id)
+        self.edge_cols: List[int] = []
+        self.node_ids: List[str] = []
+        node_index = first_node_index
+        for token, value, start_col in tokenize(line):
+            if token == NODE_TOKEN:
+                self.kinds[start_col:start_col + len(value)] = bytes([NODE]) * len(value)
+                self.nodes.update(dict.fromkeys(range(start_col, start_col + len(value)), (node_index, value)))
+                self.node_ids.append(value)
+                node_index += 1
+            else:
+                self.kinds[start_col:start_col + len(value)] = value
+                self.edge_cols.extend(range(start_col, start_col + len(value)))
+        self.next_node_index = node_index
+
+    def kind(self, col: int) -> int:
+        return self.kinds[col] if 0 <= col < len(self.kinds) else EMPTY
+
+EMPTY_ROW = StreamRow('', 0)
+
+class BoundaryLink(NamedTuple):
+    # Link of an edge cell to a cell of the previous row, which is resolved separately
+    col: int
+    previous_col: int
+    same_direction: Optional[bool] # None if the previous row's cell is a connector
+    side: int
+    connector_offset: Optional[Tuple[int, int]] # of the cell from the connector
+
+class EdgeSegment:
+    # Part of an edge found so far - a set of edge cells with a root holding the edge's endpoints. Edges are paths,
+    # so a cell's side 0 points either towards the root's side 0 end of the path (parity 0) or the other way.
+    __slots__ = ('parent', 'parity', 'endpoints', 'first_cell', 'first_parity')
+
+    def __init__(self, row: int, col: int):
+        self.parent: EdgeSegment = self
+        self.parity = 0 # relative to parent
+        self.endpoints: List[Tuple[int, str, int]] = [] # (node index, id, direction relative to root's side 0)
+        self.first_cell = (col, row) # the first cell column by column
+        self.first_parity = 0 # first cell's parity relative to root
+
+    def find(self) -> Tuple['EdgeSegment', int]:
+        # (root, parity relative to root)
+        path = []
+        segment = self
+        while segment.parent is not segment:
+            path.append(segment)
+            segment = segment.parent
+        parity = 0
+        for segment_on_path in reversed(path):
+            parity ^= segment_on_path.parity
+            segment_on_path.parent, segment_on_path.parity = segment, parity
+        return segment, self.parity if self.parent is not self else 0
+
+    def add_endpoint(self, node: Tuple[int, str], side: int) -> None:
+        root, parity = self.find()
+        root.endpoints.append((node[0], node[1], side ^ parity))
+
+    def union(self, other: 'EdgeSegment', same_direction: bool) -> None:
+        root, parity = self.find()
+        other_root, other_parity = other.find()
+        if root is other_root:
+            return # cycle, it has no endpoints
+        root_parity = parity ^ other_parity ^ (0 if same_direction else 1) # other root relative to root
+        other_root.parent, other_root.parity = root, root_parity
+        root.endpoints.extend((node_index, id, direction ^ root_parity) for node_index, id, direction in other_root.endpoints)
+        if other_root.first_cell < root.first_cell:
+            root.first_cell, root.first_parity = other_root.first_cell, other_root.first_parity ^ root_parity
+        other_root.endpoints = []
+
+def iter_topology_edges(lines: Iterable[str]) -> Iterator[Tuple[NodeOccurrence, NodeOccurrence]]:
+    # Edges of a diagram read line by line, with the same node indices and orientation as compile_topology. Only three
+    # rows, edges crossing them and edges finished a row ago are kept. Edges come row by row of their last cells, column
+    # by column within a row, which is a different order than when compiling the whole diagram.
+    # 'N0-N1' => (NodeOccurrence(0, 'N0', True), NodeOccurrence(1, 'N1', True))
+    rows = [EMPTY_ROW, EMPTY_ROW] # previous and current row, the next one is read
+    labels: Dict[int, EdgeSegment] = {} # previous row's edge cells' segments by column
+    connectors: Dict[int, List[Tuple[int, int]]] = {} # previous row's connectors' connected offsets by column
+    pending_endpoints: Dict[int, int] = {} # node index => endpoints of not yielded edges
+    finished: List[EdgeSegment] = [] # edges of cells up to two rows above, yielded once the current row is processed
+    next_node_index = 0
+    row = -1 # current row
+    for line in _with_empty_line(lines):
+        next_row = StreamRow(line.rstrip('\r\n'), next_node_index) if line is not None else EMPTY_ROW
+        next_node_index = next_row.next_node_index
+        if row >= 0:
+            current_labels, connectors = resolve_row(rows[0], rows[1], next_row, row, labels, connectors, pending_endpoints)
+            yield from _yield_finished(finished, pending_endpoints)
+            roots = {segment.find()[0] for segment in current_labels.values()}
+            finished = _finished_edges(root for root in (segment.find()[0] for segment in labels.values()) if root not in roots)
+            labels = current_labels
+        rows = [rows[1], next_row]
+        row += 1
+    finished.extend(_finished_edges(segment.find()[0] for segment in labels.values())) # last row's edges
+    yield from _yield_finished(finished, pending_endpoints)
+
+def _with_empty_line(lines: Iterable[str]) -> Iterator[Optional[str]]:
+    yield from lines
+    yield None # below the last line
+
+def resolve_row(previous_row: StreamRow, current_row: StreamRow, next_row: StreamRow, row: int, previous_labels: Optional[Dict[int, EdgeSegment]], previous_connectors: Dict[int, List[Tuple[int, int]]], pending_endpoints: Dict[int, int], boundary_links: Optional[List[BoundaryLink]] = None) -> Tuple[Dict[int, EdgeSegment], Dict[int, List[Tuple[int, int]]]]:
+    # Each cell is joined with already resolved cells (above and to the left), later ones join it themselves. Without
+    # previous_labels the previous row is not resolved (it belongs to another band), links to it go to boundary_links.
+    window = {-1: previous_row, 0: current_row, 1: next_row}
+    current_labels: Dict[int, EdgeSegment] = {}
+    current_connectors: Dict[int, List[Tuple[int, int]]] = {}
+    labels = {-1: previous_labels, 0: current_labels}
+    connectors = {-1: previous_connectors, 0: current_connectors}
+    for col in current_row.edge_cols:
+        kind = current_row.kinds[col]
+        if kind == AsteriskConnector.kind:
+            segment = current_labels[col] = EdgeSegment(row, col)
+            offsets = current_connectors[col] = _connector_offsets(window, col)
+            if len(offsets) != 2:
+                raise ValueError(f'Connector at {_position(row, col)} joins {len(offsets)} edges, 2 expected')
+            for side, (row_offset, col_offset) in enumerate(offsets):
+                if row_offset < 0 or row_offset == 0 and col_offset < 0:
+                    edge_side = EDGES_BY_KIND[window[row_offset].kinds[col + col_offset]].offsets.index((-row_offset, -col_offset))
+                    if labels[row_offset] is None:
+                        boundary_links.append(BoundaryLink(col, col + col_offset, side != edge_side, side, None))
+                    else:
+                        segment.union(labels[row_offset][col + col_offset], side != edge_side)
+            continue
+        # Side 0 of edge characters points at an already resolved cell (above or to the left), side 1 at a later one
+        edge_offsets = EDGES_BY_KIND[kind].offsets
+        row_offset, col_offset = edge_offsets[0]
+        if labels[row_offset] is not None and window[row_offset].kind(col + col_offset) == kind:
+            # The run continues - the cell belongs to the previous cell's segment
+            segment = current_labels[col] = labels[row_offset][col + col_offset]
+            root, parity = segment.find()
+            if (col, row) < root.first_cell:
+                root.first_cell, root.first_parity = (col, row), parity
+            sides = ((1, edge_offsets[1]),)
+        else:
+            segment = current_labels[col] = EdgeSegment(row, col)
+            sides = enumerate(edge_offsets)
+        for side, (row_offset, col_offset) in sides:
+            end_row, end_col = window[row_offset], col + col_offset
+            end_kind = end_row.kind(end_col)
+            if end_kind == kind:
+                if side == 0: # previous row of another band
+                    boundary_links.append(BoundaryLink(col, end_col, True, side, None))
+            elif end_kind == NODE:
+                node = end_row.nodes[end_col]
+                segment.add_endpoint(node, side)
+                pending_endpoints[node[0]] = pending_endpoints.get(node[0], 0) + 1
+            elif end_kind == AsteriskConnector.kind:
+                if side == 0 and labels[row_offset] is None:
+                    # Connector's side is known to the band resolving its row
+                    boundary_links.append(BoundaryLink(col, end_col, None, side, (-row_offset, -col_offset)))
+                elif side == 0:
+                    connector_side = connectors[row_offset][end_col].index((-row_offset, -col_offset))
+                    segment.union(labels[row_offset][end_col], side != connector_side)
+            elif end_kind == EMPTY:
+                raise ValueError(f'Edge ends without a node at {_position(row + row_offset, end_col)}')
+            else:
+                raise ValueError(f'Edge characters are joined without a connector at {_position(row + row_offset, end_col)}')
+    return current_labels, current_connectors
+
+def _finished_edges(roots: Iterable[EdgeSegment]) -> List[EdgeSegment]:
+    finished = sorted(set(roots), key=lambda root: root.first_cell)
+    for root in finished:
+        if len(root.endpoints) != 2:
+            raise ValueError(f'Edge at {_position(root.first_cell[1], root.first_cell[0])} does not connect two nodes')
+    return finished
+
+def _connector_offsets(window: Dict[int, StreamRow], col: int) -> List[Tuple[int, int]]:
+    # Offsets of edges pointing at the connector in the window's middle row, in row by row order
+    offsets = []
+    for row_offset, col_offset in AsteriskConnector.NEIGHBOURS:
+        if window[row_offset].kind(col + col_offset) in CONNECTING_KINDS[row_offset, col_offset]:
+            offsets.append((row_offset, col_offset))
+    return offsets
+
+def _yield_finished(finished: List[EdgeSegment], pending_endpoints: Dict[int, int]) -> Iterator[Tuple[NodeOccurrence, NodeOccurrence]]:
+    # The node reached from the first cell's side 0 goes first, as when compiling the whole diagram
+    for root in finished:
+        endpoint1, endpoint2 = root.endpoints
+        if endpoint1[2] != root.first_parity:
+            endpoint1, endpoint2 = endpoint2, endpoint1
+        occurrences = []
+        for node_index, id, _ in (endpoint1, endpoint2):
+            pending_endpoints[node_index] -= 1
+            last = pending_endpoints[node_index] == 0
+            if last:
+                del pending_endpoints[node_index]
+            occurrences.append(NodeOccurrence(node_index, id, last))
+        yield occurrences[0], occurrences[1]
+    finished.clear()
+
+def _position(row: int, col: int) -> str:
+    return f'line {row + 1}, column {col + 1}'
@@ -0,0 +1,259 @@
+import asyncio
+import inspect
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from agraph.node import NodeResolution, build_bulk_nodes, check_bulk_nodes
+from agraph.result import AGraphResult
+from agraph.topology import Topology
+
+
+RelationBuilders = Dict[type, Dict[type, Callable]]
+
+ASYNC_CONCURRENCY = 10 # builders awaited at once by AGraphTemplate.ainstantiate
+
+class BulkRelationBuilder(NamedTuple):
+    type1: type
+    type2: type
+    build_relations: Callable
+
+BulkRelations = Dict[BulkRelationBuilder, List[Tuple[object, object]]] # pairs of nodes in order of edges
+
+# TODO The "reverse type recipe match" should be done when the direction of relation doesn't matter (not directed edge)
+# TODO The "recipe matching" should raise error if recipe depend on direction but edge is declared not directional
+def find_relation_builder(relation_builders: RelationBuilders, node1_type: type, node2_type: type) -> Optional[Tuple[Callable, bool]]:
+    # (relation builder, whether nodes have to be passed in reversed order)
+    if node1_type in relation_builders and node2_type in relation_builders[node1_type]:
+        return relation_builders[node1_type][node2_type], False
+    elif node2_type in relation_builders and node1_type in relation_builders[node2_type]:
+        return relation_builders[node2_type][node1_type], True
+    # The most specific builder of the types' base classes - with the lowest sum of both types' distances in their MROs,
+    # then not reversed, then with the closest first type
+    best_match = None
+    for reversed_nodes, type1, type2 in ((False, node1_type, node2_type), (True, node2_type, node1_type)):
+        type2_distances = {base_type: distance for distance, base_type in enumerate(type2.__mro__)}
+        for type1_distance, base_type1 in enumerate(type1.__mro__):
+            for base_type2, build_relation in relation_builders.get(base_type1, {}).items():
+                if base_type2 in type2_distances:
+                    rank = (type1_distance + type2_distances[base_type2], reversed_nodes, type1_distance)
+                    if best_match is None or rank < best_match[0]:
+                        best_match = (rank, build_relation)
+    if best_match is None:
+        return None
+    (_, reversed_nodes, _), build_relation = best_match
+    return build_relation, reversed_nodes
+
+class RelationDispatch:
+    # Relation builders with memoized lookups by node types
+    def __init__(self, relation_builders: RelationBuilders):
+        self.relation_builders: RelationBuilders = {type1: dict(builders) for type1, builders in relation_builders.items()}
+        self.__relation_builders_by_types: Dict[Tuple[type, type], Optional[Tuple[Callable, bool]]] = {}
+
+    def find(self, node1_type: type, node2_type: type) -> Optional[Tuple[Callable, bool]]:
+        try:
+            return self.__relation_builders_by_types[node1_type, node2_type]
+        except KeyError:
+            relation_builder = find_relation_builder(self.relation_builders, node1_type, node2_type)
+            self.__relation_builders_by_types[node1_type, node2_type] = relation_builder
+            return relation_builder
+
+class AGraphTemplate:
+    # Compiled diagram which can be instantiated many times. Node resolutions and relation builders are taken when
+    # the template is compiled, so later registrations don't change it.
+    def __init__(self, topology: Topology, node_resolutions: Tuple[Optional[NodeResolution], ...], relation_dispatch: RelationDispatch, generate_code: bool = False):
+        self.topology = topology
+        self.node_resolutions = node_resolutions # by node occurrence, None for not resolved and not connected occurrences
+        self.__relation_dispatch = relation_dispatch
+        self.__bulk_node_groups = self.__group_bulk_nodes()
+        # Generated code is specialized for types of nodes built by the first instantiation
+        self.generate_code = generate_code
+        self.source: Optional[str] = None
+        self.__generated_instantiate: Optional[Callable[[], List[List]]] = None
+
+    def instantiate(self, workers: Optional[int] = None, lazy: bool = False) -> AGraphResult:
+        # Builders run in a pool of worker threads if more than one worker is requested, serially in order otherwise.
+        # Lazy instances get stand-ins of nodes, each connected part of the diagram is built on its first use.
+        if lazy:
+            if workers is not None and workers > 1:
+                raise ValueError('Lazy nodes are built when used, not by workers')
+            from agraph.lazy import instantiate_lazily # lazy nodes depend on the template
+            return instantiate_lazily(self)
+        if workers is not None and workers > 1:
+            return AGraphResult(self.topology, self.__instantiate_threaded(workers))
+        if self.__generated_instantiate is not None:
+            return AGraphResult(self.topology, self.__generated_instantiate())
+        node_types: Optional[Dict[int, type]] = {} if self.generate_code else None
+        edges = self.__instantiate(node_types)
+        if self.generate_code:
+            from agraph.codegen import generate_instantiate # codegen depends on the template
+            self.source, self.__generated_instantiate = generate_instantiate(self, node_types)
+        return AGraphResult(self.topology, edges)
+
+    def part(self, edge_indices: List[int]) -> 'AGraphTemplate':
+        # Template of some of the diagram's edges, with the same node resolutions and relation builders
+        topology = Topology(self.topology.node_ids, tuple(self.topology.edges[edge_index] for edge_index in edge_indices))
+        return AGraphTemplate(topology, self.node_resolutions, self.__relation_dispatch)
+
+    def relation_builder(self, node1_type: type, node2_type: type) -> Optional[Tuple[Callable, bool]]:
+        return self.__relation_dispatch.find(node1_type, node2_type)
+
+    def build_relation(self, node1, node2, bulk_relations: BulkRelations) -> None:
+        relation = self.__oriented_relation(node1, node2, bulk_relations)
+        if relation is not None:
+            build_relation, node1, node2 = relation
+            build_relation(node1, node2)
+
+    def __oriented_relation(self, node1, node2, bulk_relations: BulkRelations) -> Optional[Tuple[Callable, object, object]]:
+        # Pairs of bulk relation builders are collected to bulk_relations
+        relation_builder = self.relation_builder(type(node1), type(node2))
+        if relation_builder is None:
+            return None
+        build_relation, reversed_nodes = relation_builder
+        if reversed_nodes:
+            node1, node2 = node2, node1
+        if isinstance(build_relation, BulkRelationBuilder):
+            bulk_relations.setdefault(build_relation, []).append((node1, node2))
+            return None
+        return build_relation, node1, node2
+
+    @staticmethod
+    def build_bulk_relations(bulk_relations: BulkRelations) -> None:
+        # Batches run after all single relations, in order of their first edges
+        for bulk_relation_builder, node_pairs in bulk_relations.items():
+            bulk_relation_builder.build_relations(node_pairs)
+
+    def build_bulk_nodes(self) -> Dict[int, object]:
+        # Nodes of bulk node builders are built before others, one call per type in order of the types' first edges
+        built_nodes = {}
+        for type_name, build_nodes, node_indices, args in self.__bulk_node_groups:
+            built_nodes.update(zip(node_indices, build_bulk_nodes(type_name, build_nodes, args)))
+        return built_nodes
+
+    async def ainstantiate(self, concurrency: int = ASYNC_CONCURRENCY) -> AGraphResult:
+        # Builders may be sync or async. All nodes are built concurrently, then relations of all edges, then bulk relations
+        semaphore = asyncio.Semaphore(concurrency)
+        async def call(function: Callable, *args) -> object:
+            async with semaphore:
+                result = function(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        node_resolutions = self.node_resolutions
+        built_nodes: Dict[int, object] = {}
+        bulk_nodes = await asyncio.gather(*(call(build_nodes, args) for _, build_nodes, _, args in self.__bulk_node_groups))
+        for (type_name, _, node_indices, args), nodes in zip(self.__bulk_node_groups, bulk_nodes):
+            built_nodes.update(zip(node_indices, check_bulk_nodes(type_name, nodes, args)))
+        node_indices = []
+        for node_index in dict.fromkeys(node_index for edge in self.topology.edges for node_index in edge): # in order of edges
+            if node_resolutions[node_index] is None:
+                built_nodes[node_index] = None
+            elif node_index not in built_nodes:
+                node_indices.append(node_index)
+        nodes = await asyncio.gather(*(call(node_resolutions[node_index].build_node, *node_resolutions[node_index].args) for node_index in node_indices))
+        built_nodes.update(zip(node_indices, nodes))
+
+        bulk_relations: BulkRelations = {}
+        relations: List[Awaitable] = []
+        edges = []
+        for node_index1, node_index2 in self.topology.edges:
+            node1, node2 = built_nodes[node_index1], built_nodes[node_index2]
+            relation = self.__oriented_relation(node1, node2, bulk_relations)
+            if relation is not None:
+                relations.append(call(*relation))
+            edges.append([node1, node2])
+        await asyncio.gather(*relations)
+        for bulk_relation_builder, node_pairs in bulk_relations.items(): # batches one by one, in deterministic order
+            await call(bulk_relation_builder.build_relations, node_pairs)
+        return AGraphResult(self.topology, edges)
+
+    def __instantiate_threaded(self, workers: int) -> List[List]:
+        # Diagram as a graph of tasks - node builders run at once, the relation of an edge as soon as both its nodes are
+        # built. Bulk relations run last, serially in their usual order. The first failed builder's exception is raised.
+        node_resolutions = self.node_resolutions
+        built_nodes: Dict[int, object] = {}
+        edge_indices_by_node: Dict[int, List[int]] = {}
+        for edge_index, edge in enumerate(self.topology.edges):
+            for node_index in set(edge):
+                edge_indices_by_node.setdefault(node_index, []).append(edge_index)
+        pending_nodes = [len(set(edge)) for edge in self.topology.edges] # not built nodes of edges
+
+        with ThreadPoolExecutor(workers) as executor:
+            tasks: Dict[Future, List[int]] = {} # task => node indices it builds, empty for relations
+            def nodes_built(node_indices: List[int]) -> None:
+                for node_index in node_indices:
+                    for edge_index in edge_indices_by_node[node_index]:
+                        pending_nodes[edge_index] -= 1
+                        if pending_nodes[edge_index] == 0:
+                            node_index1, node_index2 = self.topology.edges[edge_index]
+                            relation = self.__oriented_relation(built_nodes[node_index1], built_nodes[node_index2], {})
+                            if relation is not None:
+                                tasks[executor.submit(*relation)] = []
+
+            for type_name, build_nodes, node_indices, args in self.__bulk_node_groups:
+                tasks[executor.submit(build_bulk_nodes, type_name, build_nodes, args)] = node_indices
+            for node_index in edge_indices_by_node:
+                if node_resolutions[node_index] is None:
+                    built_nodes[node_index] = None
+                    nodes_built([node_index])
+                elif not node_resolutions[node_index].bulk:
+                    tasks[executor.submit(node_resolutions[node_index].build)] = [node_index]
+
+            while tasks:
+                done, _ = wait(tasks, return_when=FIRST_COMPLETED)
+                for task in done:
+                    node_indices = tasks.pop(task)
+                    if task.exception() is not None:
+                        for pending_task in tasks:
+                            pending_task.cancel()
+                        raise task.exception()
+                    if node_indices:
+                        nodes = task.result()
+                        built_nodes.update(zip(node_indices, nodes if node_resolutions[node_indices[0]].bulk else [nodes]))
+                        nodes_built(node_indices)
+
+        bulk_relations: BulkRelations = {}
+        edges = []
+        for node_index1, node_index2 in self.topology.edges:
+            node1, node2 = built_nodes[node_index1], built_nodes[node_index2]
+            self.__oriented_relation(node1, node2, bulk_relations) # single relations are already built
+            edges.append([node1, node2])
+        self.build_bulk_relations(bulk_relations)
+        return edges
+
+    def __group_bulk_nodes(self) -> List[Tuple[str, Callable, List[int], List[str]]]:
+        groups: Dict[str, Tuple[str, Callable, List[int], List[str]]] = {}
+        grouped_node_indices = set()
+        for edge in self.topology.edges:
+            for node_index in edge:
+                resolution = self.node_resolutions[node_index]
+                if resolution is None or not resolution.bulk or node_index in grouped_node_indices:
+                    continue
+                grouped_node_indices.add(node_index)
+                if resolution.type_name not in groups:
+                    groups[resolution.type_name] = (resolution.type_name, resolution.build_node, [], [])
+                _, _, node_indices, args = groups[resolution.type_name]
+                node_indices.append(node_index)
+                args.append(resolution.args[0])
+        return list(groups.values())
+
+    def __instantiate(self, node_types: Optional[Dict[int, type]]) -> List[List]:
+        # Nodes are built in order of edges, each relation right after its nodes (as if the diagram was compiled again)
+        node_resolutions = self.node_resolutions
+        built_nodes: Dict[int, object] = self.build_bulk_nodes() # identity map - each node occurrence is built once per instance
+        bulk_relations: BulkRelations = {}
+        edges = []
+        for node_index1, node_index2 in self.topology.edges:
+            if node_index1 not in built_nodes:
+                built_nodes[node_index1] = node_resolutions[node_index1].build() if node_resolutions[node_index1] is not None else None
+            if node_index2 not in built_nodes:
+                built_nodes[node_index2] = node_resolutions[node_index2].build() if node_resolutions[node_index2] is not None else None
+            node1, node2 = built_nodes[node_index1], built_nodes[node_index2]
+            self.build_relation(node1, node2, bulk_relations)
+            edges.append([node1, node2]) # list of connected nodes
+        self.build_bulk_relations(bulk_relations)
+        if node_types is not None:
+            node_types.update((node_index, type(node)) for node_index, node in built_nodes.items())
+        return edges
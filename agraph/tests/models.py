@@ -0,0 +1,16 @@
+# Model types of the tests. Node ids are resolved to types by class names, which are global, so the names are unique.
+
+class ExampleCompany:
+    def __init__(self, id: str = ''):
+        self.id = id
+        self.employees = []
+
+class ExampleEmployee:
+    def __init__(self, id: str = ''):
+        self.id = id
+        self.company = None
+
+class ExampleDepartment:
+    def __init__(self, id: str = ''):
+        self.id = id
+        self.employees = []
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.tests.models import ExampleCompany, ExampleDepartment, ExampleEmployee
+
+
+class TestAGraphAbuild(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.running = 0
+        self.max_running = 0
+
+    async def build_employee(self, id: str) -> ExampleEmployee:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return ExampleEmployee(id)
+
+    def test_should_build_nodes_with_async_and_sync_builders(self):
+        async def add_employee(company: ExampleCompany, employee: ExampleEmployee) -> None:
+            await asyncio.sleep(0)
+            company.employees.append(employee)
+        self.agraph.register_node_builder(ExampleEmployee, self.build_employee)
+        self.agraph.register_node_builder(ExampleCompany, lambda: ExampleCompany('sync'))
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, add_employee)
+        self.agraph.set_representation(r'''
+            ExampleEmployee1  ExampleEmployee2
+                            \  /
+                       ExampleCompany-ExampleEmployee3
+        ''')
+
+        graph = asyncio.run(self.agraph.abuild())
+
+        company = graph[0][1]
+        self.assertEqual(company.id, 'sync')
+        self.assertEqual(sorted(employee.id for employee in company.employees), ['1', '2', '3'])
+        self.assertEqual(self.max_running, 3) # built concurrently
+
+    def test_should_limit_concurrency(self):
+        self.agraph.register_node_builder(ExampleEmployee, self.build_employee)
+        self.agraph.set_representation(r'ExampleEmployee1-ExampleEmployee2-ExampleEmployee3-ExampleEmployee4')
+
+        graph = asyncio.run(self.agraph.abuild(concurrency=2))
+
+        self.assertEqual([[node1.id, node2.id] for node1, node2 in graph], [['1', '2'], ['2', '3'], ['3', '4']])
+        self.assertEqual(self.max_running, 2)
+
+    def test_should_build_relations_after_nodes(self):
+        built = []
+        async def build_department() -> ExampleDepartment:
+            await asyncio.sleep(0.01)
+            built.append('department')
+            return ExampleDepartment()
+        def add_employee(department: ExampleDepartment, employee: ExampleEmployee) -> None:
+            built.append('relation')
+            department.employees.append(employee)
+        self.agraph.register_node_builder(ExampleDepartment, build_department)
+        self.agraph.register_relation_builder(ExampleDepartment, ExampleEmployee, add_employee)
+        self.agraph.set_representation(r'ExampleEmployee1-ExampleDepartment')
+
+        graph = asyncio.run(self.agraph.abuild())
+
+        self.assertEqual(built, ['department', 'relation'])
+        self.assertEqual(graph[0][1].employees, [graph[0][0]])
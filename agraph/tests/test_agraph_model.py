@@ -40,6 +40,19 @@ class Organization:
     def __init__(self, id:int):
         self.id = id
 
+class Department:
+    def __init__(self, id:str = ''):
+        self.id = id
+        self.built_by = 'constructor'
+
+class Team:
+    def __init__(self, id:str):
+        self.id = id
+
+class Project:
+    def __init__(self, id:str):
+        self.id = id
+
 class TestAGraphModel(unittest.TestCase):
 
     def test_should_associate_node_id_with_registered_instance(self):
@@ -229,6 +242,96 @@ class TestAGraphModel(unittest.TestCase):
             ids.update([edge[0].id, edge[1].id])
         self.assertEqual(len(ids), 3)
 
+    def test_should_build_node_once_for_all_its_edges(self):
+        self.agraph_model = AGraphModel()
+        self.agraph_compiler = AGraphCompiler(self.agraph_model)
+
+        built_organizations = []
+        def build_organization() -> Organization:
+            organization = Organization(1)
+            built_organizations.append(organization)
+            return organization
+        self.agraph_compiler.register_node_builder(Organization, build_organization)
+
+        self.agraph_representation = r'''
+            Person1         Person2
+                   \          /
+            Person3-Organization-Person4
+                   /          \
+            Person5         Person6
+        '''
+
+        self.agraph_compiler.set_representation(self.agraph_representation)
+        self.graph = self.agraph_compiler.compile()
+
+        self.assertEqual(len(self.graph), 6)
+        self.assertEqual(len(built_organizations), 1)
+        for edge in self.graph:
+            self.assertIn(built_organizations[0], edge)
+
+    def test_should_use_node_builder_registered_after_type_resolution(self):
+        self.agraph_model = AGraphModel()
+        self.agraph_compiler = AGraphCompiler(self.agraph_model)
+
+        self.agraph_compiler.set_representation(r'Department1-Department2')
+        self.graph = self.agraph_compiler.compile()
+        self.assertEqual(self.graph[0][0].built_by, 'constructor')
+
+        def build_department(id: str) -> Department:
+            department = Department(id)
+            department.built_by = 'builder'
+            return department
+        self.agraph_compiler.register_node_builder(Department, build_department)
+        self.graph = self.agraph_compiler.compile()
+
+        self.assertEqual(self.graph[0][0].built_by, 'builder')
+        self.assertEqual(self.graph[0][0].id, '1')
+        self.assertEqual(self.graph[0][1].id, '2')
+
+    def test_should_build_all_nodes_of_type_with_one_bulk_node_builder_call(self):
+        self.agraph_model = AGraphModel()
+        self.agraph_compiler = AGraphCompiler(self.agraph_model)
+
+        bulk_calls = []
+        def build_teams(ids: List[str]) -> List[Team]:
+            bulk_calls.append(ids)
+            return [Team(id) for id in ids]
+        self.agraph_compiler.register_bulk_node_builder(Team, build_teams)
+
+        self.agraph_compiler.set_representation(r'''
+            Team1-Person1-Team2
+                    |
+            Team3-Team-Team1
+        ''')
+        self.graph = self.agraph_compiler.compile()
+
+        self.assertEqual(bulk_calls, [['1', '3', '', '1', '2']])
+        self.assertEqual([[type(node1), type(node2)] for node1, node2 in self.graph], [[Team, Person], [Team, Team], [Person, Team], [Team, Team], [Person, Team]])
+        self.assertEqual([[node.id for node in edge] for edge in self.graph], [['1', '1'], ['3', ''], ['1', ''], ['', '1'], ['1', '2']])
+        self.assertIs(self.graph[1][1], self.graph[2][1])
+        self.assertIsNot(self.graph[0][0], self.graph[3][1]) # separately drawn nodes are separate objects
+
+    def test_should_build_relations_of_type_combination_with_one_bulk_relation_builder_call(self):
+        self.agraph_model = AGraphModel()
+        self.agraph_compiler = AGraphCompiler(self.agraph_model)
+
+        bulk_calls = []
+        self.agraph_compiler.register_bulk_relation_builder(Project, Person, lambda pairs: bulk_calls.append(('Project-Person', pairs)))
+        self.agraph_compiler.register_bulk_relation_builder(Team, Project, lambda pairs: bulk_calls.append(('Team-Project', pairs)))
+
+        self.agraph_compiler.set_representation(r'''
+            Person1-Project1-Team1
+                       |
+            Project2-Person2
+        ''')
+        self.graph = self.agraph_compiler.compile()
+
+        self.assertEqual(len(self.graph), 4)
+        self.assertEqual([(name, [(node1.id, node2.id) for node1, node2 in pairs]) for name, pairs in bulk_calls], [
+            ('Project-Person', [('1', '1'), ('2', '2'), ('1', '2')]),
+            ('Team-Project', [('1', '1')]),
+        ])
+
     def test_should_be_able_to_register_model_type(self):
         pass
 
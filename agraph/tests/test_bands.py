@@ -0,0 +1,51 @@
+import unittest
+from unittest import mock
+
+from agraph.agraph import AGraph
+from agraph.bands import compile_topology_in_bands
+from agraph.topology import compile_topology
+
+
+class TestBands(unittest.TestCase):
+    def setUp(self):
+        self.representation = r'''
+            N0  N1     N2
+              \ |     /
+               N3    /
+                    /
+            N4-----*
+            |
+            *--N5
+               |
+               N6-*
+                   \
+                    N7
+        '''
+
+    def test_should_compile_topology_of_serial_engine(self):
+        expected = compile_topology(self.representation)
+
+        for band_rows in range(1, 5):
+            self.assertEqual(compile_topology_in_bands(self.representation, workers=1, band_rows=band_rows), expected)
+
+    def test_should_compile_bands_in_worker_processes(self):
+        self.assertEqual(compile_topology_in_bands(self.representation, workers=2, band_rows=3), compile_topology(self.representation))
+
+    def test_should_compile_serially_with_one_worker_or_band(self):
+        with mock.patch('agraph.bands.resolve_band') as resolve_band:
+            self.assertEqual(compile_topology_in_bands(self.representation, workers=1), compile_topology(self.representation))
+            self.assertEqual(compile_topology_in_bands(self.representation, workers=4), compile_topology(self.representation))
+
+        resolve_band.assert_not_called()
+
+    def test_should_raise_error_of_edge_split_by_bands(self):
+        with self.assertRaisesRegex(ValueError, 'Edge at line 1, column 1 does not connect two nodes'):
+            compile_topology_in_bands('*-*\n| |\n*-*', workers=1, band_rows=1)
+
+    def test_should_be_agraph_backend(self):
+        agraph = AGraph(backend='parallel')
+        agraph.register_node('N0', 'node0')
+        agraph.register_node('N1', 'node1')
+        agraph.set_representation('N0\n|\nN1')
+
+        self.assertEqual(agraph.build(), [['node0', 'node1']])
@@ -0,0 +1,99 @@
+import threading
+import unittest
+
+from unittest import mock
+
+from agraph.agraph import AGraph
+from agraph.builders import BuilderRegistry
+from agraph.model import AGraphModel
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+
+
+class TestBuilderRegistry(unittest.TestCase):
+    def test_should_prefer_own_builders_over_shared(self):
+        shared = BuilderRegistry()
+        registry = BuilderRegistry(shared)
+        shared.register_node_builder(ExampleCompany, 'shared')
+        registry.register_node_builder(ExampleCompany, 'own')
+        shared.register_relation_builder(ExampleCompany, ExampleEmployee, 'shared')
+
+        self.assertEqual(registry.node_builder('ExampleCompany1'), ('ExampleCompany', 'own'))
+        self.assertEqual(shared.node_builder('ExampleCompany1'), ('ExampleCompany', 'shared'))
+        self.assertEqual(registry.relation_builders_snapshot(), {ExampleCompany: {ExampleEmployee: 'shared'}})
+
+    def test_should_change_version_with_shared_registrations(self):
+        shared = BuilderRegistry()
+        registry = BuilderRegistry(shared)
+        version = registry.version
+
+        shared.register_node_builder(ExampleCompany, 'shared')
+
+        self.assertNotEqual(registry.version, version)
+
+class TestScopedRegistries(unittest.TestCase):
+    def test_should_not_share_registrations_between_instances(self):
+        agraph1, agraph2 = AGraph(), AGraph()
+        agraph1.register_node_builder(ExampleCompany, lambda: ExampleCompany('builder'))
+        agraph1.register_node('E', ExampleEmployee('registered'))
+        agraph1.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+        agraph1.set_representation('ExampleCompany-E')
+        agraph2.set_representation('ExampleCompany-E')
+
+        company1, employee1 = agraph1.build()[0]
+        company2, employee2 = agraph2.build()[0]
+
+        self.assertEqual((company1.id, employee1.id, len(company1.employees)), ('builder', 'registered', 1))
+        self.assertEqual((company2.id, employee2, len(company2.employees)), ('', None, 0))
+
+    def test_should_use_shared_registrations_if_requested(self):
+        # Local shared layers, registrations don't leak into other tests
+        shared_builders, shared_model = BuilderRegistry(), AGraphModel()
+        for patcher in (mock.patch('agraph.agraph.shared_builders', shared_builders), mock.patch('agraph.agraph.shared_model', shared_model)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        shared_builders.register_node_builder(ExampleCompany, lambda: ExampleCompany('shared'))
+        shared_employee = ExampleEmployee('shared')
+        shared_model.register_node('shared_employee', shared_employee)
+        shared_agraph = AGraph(shared=True)
+        shared_agraph.set_representation('ExampleCompany-shared_employee')
+        agraph = AGraph()
+        agraph.set_representation('ExampleCompany-shared_employee')
+
+        self.assertEqual([node.id for node in shared_agraph.build()[0]], ['shared', 'shared'])
+        self.assertEqual(agraph.build()[0][0].id, '')
+        self.assertIsNot(agraph.build()[0][1], shared_employee)
+
+    def test_should_build_concurrently_with_separate_instances(self):
+        errors = []
+        def build(index: int) -> None:
+            try:
+                agraph = AGraph()
+                agraph.register_node_builder(ExampleCompany, lambda: ExampleCompany(str(index)))
+                agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+                agraph.set_representation('ExampleEmployee1-ExampleCompany-ExampleEmployee2')
+                for _ in range(20):
+                    graph = agraph.build()
+                    company = graph[0][1]
+                    if company.id != str(index) or len(company.employees) != 2:
+                        errors.append(index)
+            except Exception as exception:
+                errors.append(exception)
+        threads = [threading.Thread(target=build, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+
+class TestAGraphModelLayers(unittest.TestCase):
+    def test_should_find_nodes_of_shared_model(self):
+        shared = AGraphModel()
+        model = AGraphModel(shared)
+        shared.register_node('A', 'shared')
+        shared.register_node('B', 'shared')
+        model.register_node('B', None)
+
+        self.assertEqual(model.find_node('A'), ('shared',))
+        self.assertEqual(model.find_node('B'), (None,))
+        self.assertIsNone(model.find_node('C'))
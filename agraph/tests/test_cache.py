@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agraph.agraph import AGraph
+from agraph.cache import LRUCache, TopologyCache
+from agraph.compiler import AGraphCompiler
+from agraph.model import AGraphModel
+from agraph.topology import Topology, compile_topology
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_should_evict_least_recently_used_entry(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('N0', 'node0')
+        cache.put('N1', 'node1')
+        cache.get('N0')
+        cache.put('N2', 'node2')
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('N0'), 'node0')
+        self.assertIsNone(cache.get('N1'))
+        self.assertEqual(cache.get('N2'), 'node2')
+
+    def test_should_forget_entries_on_clear(self):
+        cache = LRUCache()
+        cache.put('N0', 'node0')
+        cache.clear()
+
+        self.assertIsNone(cache.get('N0'))
+
+class TestTopologyCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.representation = r'''
+            N0-*  Nodeé
+               |   |
+               N1 N2
+        '''
+        self.topology = compile_topology(self.representation)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_should_serialize_topology(self):
+        self.assertEqual(Topology.from_bytes(self.topology.to_bytes()), self.topology)
+        self.assertEqual(self.topology, Topology(('N0', 'Nodeé', 'N1', 'N2'), ((0, 2), (1, 3))))
+
+    def test_should_share_topology_through_directory(self):
+        TopologyCache(self.directory.name).put(self.representation, self.topology)
+
+        self.assertEqual(TopologyCache(self.directory.name).get(self.representation), self.topology)
+        self.assertIsNone(TopologyCache(self.directory.name).get('N0-N1'))
+
+    def test_should_ignore_broken_files(self):
+        cache = TopologyCache(self.directory.name)
+        with open(os.path.join(self.directory.name, f'{cache.key(self.representation)}.agt'), 'wb') as file:
+            file.write(self.topology.to_bytes()[:-3])
+
+        self.assertIsNone(cache.get(self.representation))
+
+    def test_should_compile_from_cached_topology(self):
+        model = AGraphModel()
+        model.register_node('N0', 'node0')
+        model.register_node('N1', 'node1')
+        TopologyCache(self.directory.name).put('N0-N1', Topology(('N0', 'N1'), ((1, 0),)))
+        compiler = AGraphCompiler(model, cache_dir=self.directory.name)
+        compiler.set_representation('N0-N1')
+
+        self.assertEqual(compiler.compile(), [['node1', 'node0']])
+
+    def test_should_compile_with_unusable_cache_directory(self):
+        directory = os.path.join(self.directory.name, 'file')
+        open(directory, 'w').close() # a file can't be a cache directory
+        agraph = AGraph(cache_dir=os.path.join(directory, 'cache'))
+        agraph.register_node('N0', 'node0')
+        agraph.register_node('N1', 'node1')
+        agraph.set_representation('N0-N1')
+
+        self.assertEqual(agraph.build(), [['node0', 'node1']])
+
+    def test_should_compile_with_unusable_cache_directory_from_environment(self):
+        directory = os.path.join(self.directory.name, 'file')
+        open(directory, 'w').close()
+        with mock.patch.dict(os.environ, {'AGRAPH_CACHE_DIR': os.path.join(directory, 'cache')}):
+            agraph = AGraph()
+        agraph.register_node('N0', 'node0')
+        agraph.register_node('N1', 'node1')
+        agraph.set_representation('N1-N0')
+
+        self.assertEqual(agraph.build(), [['node1', 'node0']])
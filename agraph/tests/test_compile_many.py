@@ -0,0 +1,41 @@
+import pickle
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.tests.models import ExampleCompany
+from agraph.topology import compile_topology
+
+
+class TestAGraphCompileMany(unittest.TestCase):
+    def setUp(self):
+        self.representations = [
+            'ExampleCompany1-ExampleCompany2',
+            'ExampleCompany1\n|\nExampleCompany2-ExampleCompany3',
+            'ExampleCompany4 ExampleCompany5',
+            'ExampleCompany1-ExampleCompany2',
+        ]
+
+    def test_should_compile_topologies_in_worker_processes_in_input_order(self):
+        topologies = AGraph().compile_many(self.representations, workers=2)
+
+        self.assertEqual(topologies, [compile_topology(representation) for representation in self.representations])
+        self.assertEqual(pickle.loads(pickle.dumps(topologies)), topologies)
+
+    def test_should_compile_topologies_serially_with_one_worker(self):
+        topologies = AGraph().compile_many(self.representations, workers=1)
+
+        self.assertEqual(topologies, [compile_topology(representation) for representation in self.representations])
+
+    def test_should_build_from_compiled_topologies(self):
+        agraph = AGraph()
+        topology = agraph.compile_many(self.representations[1:2], workers=2)[0]
+
+        template = agraph.compile_template(self.representations[1])
+
+        self.assertIs(template.topology, topology)
+        self.assertIsInstance(template.instantiate()[0][0], ExampleCompany)
+        self.assertEqual([[node1.id, node2.id] for node1, node2 in template.instantiate()], [['1', '2'], ['2', '3']])
+
+    def test_should_raise_error_of_illegal_representation(self):
+        with self.assertRaises(ValueError):
+            AGraph().compile_many(['ExampleCompany1-', 'ExampleCompany1--ExampleCompany2-'], workers=2)
@@ -0,0 +1,30 @@
+import unittest
+
+from agraph.edge import BackslashEdge, EdgeFactory, HorizontalEdge
+from agraph.grid import Grid
+
+
+class TestGrid(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(width=6, height=3)
+
+    def test_should_measure_run_in_both_directions(self):
+        start = self.grid.add_edges(1, 1, bytes([HorizontalEdge.kind]) * 4)[0]
+
+        self.assertEqual(self.grid.run_length(start, 1), 4)
+        self.assertEqual(self.grid.run_length(start + 3, -1), 4)
+        self.assertEqual(self.grid.run_length(start + 1, 1), 3)
+
+    def test_should_measure_diagonal_run_from_last_cell(self):
+        step = self.grid.offset(1, 1)
+        for row in range(3):
+            self.grid.add_edges(row, row, bytes([BackslashEdge.kind]))
+
+        self.assertEqual(self.grid.run_length(self.grid.index(2, 2), -step), 3)
+        self.assertEqual(self.grid.run_length(self.grid.index(0, 0), step), 3)
+
+class TestEdgeFactory(unittest.TestCase):
+    def test_should_make_edge_of_edge_character_only(self):
+        self.assertIsInstance(EdgeFactory.make_edge('-'), HorizontalEdge)
+        for character in ('N', '', '--', '\u0100', None):
+            self.assertIsNone(EdgeFactory.make_edge(character))
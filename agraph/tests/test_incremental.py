@@ -0,0 +1,76 @@
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.incremental import IncrementalTopology
+from agraph.topology import compile_topology
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.representation = r'''
+            N0-N1
+            |
+            N2
+            N3-*
+               |
+               N4
+        '''
+        self.topology = IncrementalTopology(band_rows=2)
+        self.topology.update(self.representation)
+
+    def test_should_add_all_nodes_and_edges_of_first_version(self):
+        delta = IncrementalTopology().update('N0-N1')
+
+        self.assertEqual(delta.added_nodes, (0, 1))
+        self.assertEqual(delta.added_edges, ((0, 1),))
+        self.assertEqual(delta.removed_nodes, ())
+        self.assertEqual(delta.removed_edges, ())
+
+    def test_should_compile_topology_of_serial_engine(self):
+        representation = self.representation.replace('N0-N1', 'N0 N1').replace('N3-*', 'N3 *-N5')
+
+        delta = self.topology.update(representation)
+
+        self.assertEqual(delta.topology, compile_topology(representation))
+
+    def test_should_resolve_only_edited_lines(self):
+        self.topology.update(self.representation.replace('N4', 'N4 N5'))
+
+        self.assertEqual(self.topology.resolved_lines, 2) # only the last band
+
+    def test_should_report_changed_nodes_and_edges(self):
+        representation = self.representation.replace('N0-N1', 'N0 N1').replace('N3-*', 'N3-*  N6')
+
+        delta = self.topology.update(representation)
+
+        self.assertEqual(delta.kept_nodes, {2: 2, 4: 5}) # N2 and N4, other nodes are on edited lines
+        self.assertEqual(delta.removed_nodes, (0, 1, 3))
+        self.assertEqual(delta.added_nodes, (0, 1, 3, 4))
+        self.assertEqual(delta.removed_edges, ((0, 2), (0, 1), (3, 4)))
+        self.assertEqual(delta.added_edges, ((0, 2), (3, 5)))
+
+    def test_should_keep_nodes_of_moved_lines(self):
+        delta = self.topology.update('            N7' + self.representation)
+
+        self.assertEqual(delta.kept_nodes, {index: index + 1 for index in range(5)})
+        self.assertEqual(delta.added_nodes, (0,))
+        self.assertEqual(delta.removed_edges, ())
+        self.assertEqual(delta.added_edges, ())
+        self.assertEqual(self.topology.resolved_lines, 3)
+
+    def test_should_keep_previous_version_of_invalid_diagram(self):
+        with self.assertRaises(ValueError):
+            self.topology.update(self.representation.replace('N3-*', 'N3-*-'))
+
+        self.assertEqual(self.topology.topology, compile_topology(self.representation))
+
+    def test_should_build_updated_representation(self):
+        agraph = AGraph()
+        for id in ('N0', 'N1', 'N2'):
+            agraph.register_node(id, id.lower())
+        agraph.update_representation('N0-N1')
+
+        delta = agraph.update_representation('N0-N1\n|\nN2')
+
+        self.assertEqual(delta.added_edges, ((0, 2),))
+        self.assertEqual(agraph.build(), [['n0', 'n2'], ['n0', 'n1']])
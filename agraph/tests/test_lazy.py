@@ -0,0 +1,94 @@
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.lazy import LazyNode
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.built_ids = []
+        self.agraph = AGraph()
+        self.agraph.register_node_builder(ExampleCompany, lambda id='': self.built_ids.append('ExampleCompany' + id) or ExampleCompany(id))
+        self.agraph.register_node_builder(ExampleEmployee, lambda id='': self.built_ids.append('ExampleEmployee' + id) or ExampleEmployee(id))
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, self.employ)
+        self.agraph.register_node('Office', 'office')
+        self.agraph.set_representation(r'''
+            ExampleCompany1-ExampleEmployee1   ExampleCompany2-ExampleEmployee2
+            |
+            ExampleEmployee3   ExampleCompany3-Office-ExampleCompany4
+        ''')
+
+    @staticmethod
+    def employ(company: ExampleCompany, employee: ExampleEmployee) -> None:
+        company.employees.append(employee)
+        employee.company = company
+
+    def test_should_not_build_nodes_until_used(self):
+        graph = self.agraph.build(lazy=True)
+
+        self.assertEqual(len(graph), 5)
+        self.assertEqual(self.built_ids, [])
+        self.assertFalse(LazyNode.is_built(graph.node('ExampleCompany1')))
+
+    def test_should_build_connected_nodes_with_relations_on_first_use(self):
+        graph = self.agraph.build(lazy=True)
+        company = graph.node('ExampleCompany1')
+
+        self.assertEqual([employee.id for employee in company.employees], ['3', '1'])
+        self.assertEqual(self.built_ids, ['ExampleCompany1', 'ExampleEmployee3', 'ExampleEmployee1'])
+        self.assertIs(company.employees[0].company, LazyNode.materialized(company))
+        self.assertIsInstance(company, ExampleCompany)
+
+    def test_should_build_nodes_connected_through_registered_node_together(self):
+        graph = self.agraph.build(lazy=True)
+
+        graph.node('ExampleCompany4').id
+
+        self.assertEqual(self.built_ids, ['ExampleCompany3', 'ExampleCompany4'])
+        self.assertEqual(graph.neighbours(graph.node('Office')), [graph.node('ExampleCompany3'), graph.node('ExampleCompany4')])
+
+    def test_should_filter_nodes_by_type_without_building_them(self):
+        graph = self.agraph.build(lazy=True)
+
+        companies = graph.nodes(ExampleCompany)
+        employees = graph.neighbours(graph.node('ExampleCompany1'), ExampleEmployee)
+
+        self.assertEqual(len(companies), 4)
+        self.assertEqual(len(employees), 2)
+        self.assertIsInstance(graph.node('Office'), str)
+        self.assertEqual(self.built_ids, [])
+
+    def test_should_build_whole_connected_diagram_on_first_use(self):
+        self.agraph.set_representation(r'''
+            ExampleEmployee1-ExampleCompany1-ExampleEmployee2
+                             |
+                             ExampleEmployee3
+        ''')
+        graph = self.agraph.build(lazy=True)
+
+        graph.node('ExampleEmployee1').id
+
+        self.assertEqual(len(self.built_ids), 4)
+
+    def test_should_equal_eagerly_built_graph(self):
+        self.agraph.register_node_builder(ExampleCompany, lambda id='': 'company' + id)
+        self.agraph.register_node_builder(ExampleEmployee, lambda id='': 'employee' + id)
+
+        self.assertEqual(self.agraph.build(lazy=True), self.agraph.build())
+
+    def test_should_behave_as_eagerly_built_container_and_falsy_nodes(self):
+        agraph = AGraph()
+        for id, node in (('Empty', []), ('Pair', [1, 2]), ('Zero', 0), ('Nothing', None)):
+            agraph.register_node(id, node)
+        agraph.set_representation('Empty-Pair-Zero-Nothing')
+        def use(graph) -> list:
+            empty, pair, zero = graph.node('Empty'), graph.node('Pair'), graph.node('Zero')
+            return [bool(empty), len(pair), list(pair), pair[1], 2 in pair, bool(zero), graph.node('Nothing')]
+
+        self.assertEqual(use(agraph.build(lazy=True)), use(agraph.build()))
+        self.assertIsNone(agraph.build(lazy=True).node('Nothing'))
+
+    def test_should_not_build_lazily_by_workers(self):
+        with self.assertRaises(ValueError):
+            self.agraph.build(workers=2, lazy=True)
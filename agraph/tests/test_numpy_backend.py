@@ -0,0 +1,68 @@
+import unittest
+
+from unittest import mock
+
+from agraph import numpy_backend, parser
+from agraph.cache import TopologyCache
+from agraph.compiler import AGraphCompiler
+from agraph.model import AGraphModel
+from agraph.topology import NUMPY_BACKEND
+
+
+REPRESENTATIONS = [
+    r'N0-N1',
+    r'''
+      N0
+        \ N1--N2    N9
+         N3--N4 \  /
+        /  \ N5--N6--N10
+      N7    N8  /  \
+               N11 N12
+    ''',
+    r'''
+      N0----N1
+     /|    /||\
+    N7**--* |*N2
+    |//     | \\
+    N6      |  N3
+     \      | /
+      N5----N4
+    ''',
+    'Nodeé N2　-ā x',
+]
+
+@unittest.skipUnless(numpy_backend.available(), 'numpy is not installed')
+class TestNumpyBackend(unittest.TestCase):
+    def test_should_parse_same_grid_as_python_backend(self):
+        for representation in REPRESENTATIONS:
+            lines = [line for line in representation.splitlines() if line.strip()]
+            python_grid, python_edge_starts = parser.parse(lines)
+            numpy_grid, numpy_edge_starts = numpy_backend.parse(lines)
+
+            self.assertEqual(numpy_grid.kinds, python_grid.kinds)
+            self.assertEqual(numpy_grid.nodes, python_grid.nodes)
+            self.assertEqual(numpy_grid.node_ids, python_grid.node_ids)
+            self.assertEqual(numpy_edge_starts, python_edge_starts)
+
+    def test_should_compile_with_numpy_backend(self):
+        model = AGraphModel()
+        for index in range(13):
+            model.register_node(f'N{index}', f'node{index}')
+        compiler = AGraphCompiler(model, backend=NUMPY_BACKEND)
+        compiler.set_representation(REPRESENTATIONS[1])
+
+        self.assertEqual(len(compiler.compile()), 11)
+
+class TestNumpyBackendFallback(unittest.TestCase):
+    def test_should_fall_back_to_python_backend_without_numpy(self):
+        model = AGraphModel()
+        model.register_node('N0', 'node0')
+        model.register_node('N1', 'node1')
+        compiler = AGraphCompiler(model, backend=NUMPY_BACKEND)
+        compiler.topology_cache = TopologyCache() # not compiled by other tests
+        compiler.set_representation(REPRESENTATIONS[0])
+
+        with mock.patch.object(numpy_backend, 'numpy', None), mock.patch.object(parser, 'parse', wraps=parser.parse) as parse:
+            self.assertEqual(compiler.compile(), [['node0', 'node1']])
+
+        parse.assert_called_once()
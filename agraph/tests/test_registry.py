@@ -0,0 +1,127 @@
+import importlib
+import inspect
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+from unittest import mock
+
+from agraph.compiler import AGraphCompiler
+from agraph.model import AGraphModel
+from agraph.registry import ClassRegistry, class_registry
+
+
+class RegistryModelType:
+    def __init__(self, id: str = ''):
+        self.id = id
+
+class TestClassRegistry(unittest.TestCase):
+    def tearDown(self):
+        sys.modules.pop('agraph_registry_test_module', None)
+        sys.modules.pop('agraph_registry_test_other_module', None)
+
+    def test_should_find_classes_of_loaded_modules(self):
+        registry = ClassRegistry()
+
+        self.assertIs(registry.classes()['RegistryModelType'], RegistryModelType)
+
+    def test_should_find_classes_of_modules_loaded_after_first_scan(self):
+        registry = ClassRegistry()
+        registry.classes()
+
+        module = types.ModuleType('agraph_registry_test_module')
+        exec('class LateRegistryModelType:\n    pass', module.__dict__)
+        sys.modules[module.__name__] = module
+
+        self.assertIs(registry.classes()['LateRegistryModelType'], module.LateRegistryModelType)
+
+    def test_should_find_classes_of_module_imported_after_other_was_removed(self):
+        compiler = AGraphCompiler()
+        compiler.set_representation(r'LateWidget1-LateWidget2')
+        with mock.patch.dict(sys.modules):
+            sys.modules['agraph_registry_test_module'] = types.ModuleType('agraph_registry_test_module')
+            compiler.compile()
+        module = types.ModuleType('agraph_registry_test_other_module')
+        exec('class LateWidget:\n    def __init__(self, id=""):\n        self.id = id', module.__dict__)
+        sys.modules[module.__name__] = module # as many modules as in the last scan
+
+        self.assertIsInstance(compiler.compile()[0][0], module.LateWidget)
+
+    def test_should_find_classes_of_reloaded_modules(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'agraph_registry_test_reloaded_module.py'), 'w') as file:
+                file.write('class ReloadedWidget:\n    def __init__(self, id=""):\n        self.id = id\n')
+            sys.path.insert(0, directory)
+            self.addCleanup(sys.path.remove, directory)
+            self.addCleanup(sys.modules.pop, 'agraph_registry_test_reloaded_module', None)
+            module = importlib.import_module('agraph_registry_test_reloaded_module')
+            compiler = AGraphCompiler()
+            compiler.set_representation(r'ReloadedWidget1-ReloadedWidget2')
+            compiler.compile()
+
+            module = importlib.reload(module)
+
+            self.assertIsInstance(compiler.compile()[0][0], module.ReloadedWidget)
+
+    def test_should_scan_module_being_imported_again_only_once_imported(self):
+        module = types.ModuleType('agraph_registry_test_module')
+        module.__spec__ = mock.Mock(_initializing=True)
+        exec('class ImportingRegistryModelType:\n    pass', module.__dict__)
+        sys.modules[module.__name__] = module
+        registry = ClassRegistry()
+        registry.classes()
+        exec('class ImportedRegistryModelType:\n    pass', module.__dict__)
+
+        with mock.patch('inspect.getmembers', wraps=inspect.getmembers) as getmembers:
+            for _ in range(3):
+                registry.refresh()
+            getmembers.assert_not_called()
+            module.__spec__._initializing = False
+
+            self.assertIs(registry.classes()['ImportedRegistryModelType'], module.ImportedRegistryModelType)
+            getmembers.assert_called_once()
+
+    def test_should_not_scan_modules_unless_node_type_is_auto_detected(self):
+        model = AGraphModel()
+        model.register_node('N0', 'node0')
+        model.register_node('N1', 'node1')
+
+        with mock.patch.object(class_registry, 'refresh') as refresh:
+            compiler = AGraphCompiler(model)
+            compiler.set_representation(r'N0-N1')
+            compiler.compile()
+
+        refresh.assert_not_called()
+
+    def test_should_scan_modules_once_per_diagram(self):
+        with mock.patch.object(class_registry, 'refresh', wraps=class_registry.refresh) as refresh:
+            compiler = AGraphCompiler()
+            compiler.set_representation(r'RegistryModelType1-RegistryModelType2-RegistryModelType3')
+            compiler.compile()
+
+        refresh.assert_called_once()
+
+    def test_should_share_auto_detected_node_types_between_compilers(self):
+        for _ in range(2):
+            compiler = AGraphCompiler()
+            compiler.set_representation(r'RegistryModelType1-RegistryModelType2')
+            compiler.compile()
+
+        with mock.patch.object(class_registry, 'longest_prefix', wraps=class_registry.longest_prefix) as longest_prefix:
+            compiler = AGraphCompiler()
+            compiler.set_representation(r'RegistryModelType1-RegistryModelType2')
+            graph = compiler.compile()
+
+        longest_prefix.assert_not_called()
+        self.assertIsInstance(graph[0][0], RegistryModelType)
+
+    def test_should_resolve_auto_detected_node_types_again_once_class_is_rebound(self):
+        for module_name in ('agraph_registry_test_module', 'agraph_registry_test_other_module'):
+            module = types.ModuleType(module_name)
+            exec('class ReboundRegistryModelType:\n    def __init__(self, id=""):\n        self.id = id', module.__dict__)
+            sys.modules[module.__name__] = module
+            graph = AGraphCompiler().compile_template(r'ReboundRegistryModelType1-ReboundRegistryModelType2').instantiate()
+
+            self.assertIsInstance(graph[0][0], module.ReboundRegistryModelType)
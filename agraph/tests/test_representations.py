@@ -72,6 +72,18 @@ class TestBasicRepresentations(unittest.TestCase):
             N1
         '''
 
+    def test_long_horizontal(self):
+        self.agraph_representation = 'N0' + '-' * 500 + 'N1'
+
+    def test_long_vertical(self):
+        self.agraph_representation = '\n'.join(['N0'] + ['|'] * 500 + ['N1'])
+
+    def test_long_backslash(self):
+        self.agraph_representation = '\n'.join([' N0'] + [' ' * (2 + row) + '\\' for row in range(500)] + [' ' * 502 + 'N1'])
+
+    def test_long_forwardslash(self):
+        self.agraph_representation = '\n'.join([' ' * 503 + 'N0'] + [' ' * (502 - row) + '/' for row in range(500)] + [' N1'])
+
 class TestAsteriskConnector(TestBasicRepresentations):
     def test_asterisk_vertical(self):
         self.agraph_representation = r'''
@@ -256,6 +268,46 @@ class TestComplexRepresentations(unittest.TestCase):
         self.register_nodes_in_representation(8)
         self.register_edges_in_representation(12, ('N0', 'N6'), ('N1', 'N3'), ('N1', 'N4'), ('N1', 'N6'))
 
+class TestIllegalRepresentations(unittest.TestCase):
+    def setUp(self):
+        self.agraph_model = AGraphModel()
+        for index in range(4):
+            self.agraph_model.register_node(f'N{index}', f'node{index}')
+        self.agraph_compiler = AGraphCompiler(self.agraph_model)
+
+    def tearDown(self):
+        self.agraph_compiler.set_representation(self.agraph_representation)
+        with self.assertRaises(ValueError):
+            self.agraph_compiler.compile()
+
+    def test_unattached_edge(self):
+        self.agraph_representation = r'N0-N1-'
+
+    def test_edge_bent_without_connector(self):
+        self.agraph_representation = r'''
+        N0
+          \
+           |
+           N1
+        '''
+
+    def test_connector_joining_three_edges(self):
+        self.agraph_representation = r'''
+        N0-*-N1
+           |
+           N2
+        '''
+
+    def test_connector_with_single_edge(self):
+        self.agraph_representation = r'N0-*'
+
+    def test_edge_without_nodes(self):
+        self.agraph_representation = r'''
+           *-*
+           | |
+           *-*
+        '''
+
 class TestBrokenGraphs():
     def setUp(self):
         self.agraph_model = AGraphModel()
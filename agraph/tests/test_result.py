@@ -0,0 +1,52 @@
+import unittest
+
+from agraph import numpy_backend
+from agraph.agraph import AGraph
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+
+
+class TestResult(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.agraph.register_node_builder(ExampleCompany, ExampleCompany)
+        self.agraph.register_node_builder(ExampleEmployee, ExampleEmployee)
+        self.agraph.register_node('Office', 'office')
+        self.agraph.set_representation(r'''
+            ExampleEmployee1   ExampleEmployee2
+                            \ /
+                     ExampleCompany1---Office
+                                  \
+            ExampleEmployee1       Office
+        ''')
+        self.graph = self.agraph.build()
+
+    def test_should_be_list_of_connected_nodes(self):
+        self.assertEqual(len(self.graph), 4)
+        self.assertEqual([[type(node1), type(node2)] for node1, node2 in self.graph][0], [ExampleEmployee, ExampleCompany])
+
+    def test_should_find_node_by_id(self):
+        self.assertEqual(self.graph.node('ExampleCompany1').id, '1')
+        self.assertEqual(self.graph.node('Office'), 'office')
+        with self.assertRaises(KeyError):
+            self.graph.node('ExampleEmployee3')
+
+    def test_should_find_neighbours(self):
+        company = self.graph.node('ExampleCompany1')
+
+        self.assertEqual([employee.id for employee in self.graph.neighbours(company, ExampleEmployee)], ['1', '2'])
+        self.assertEqual(self.graph.neighbours(self.graph.node('Office')), [company]) # registered node occurs twice
+        self.assertEqual(self.graph.degree(company), 4)
+        self.assertEqual(self.graph.degree('office'), 2)
+
+    def test_should_list_nodes_of_type(self):
+        self.assertEqual(len(self.graph.nodes()), 4) # not connected ExampleEmployee1 is not built
+        self.assertEqual(self.graph.nodes(ExampleCompany), [self.graph.node('ExampleCompany1')])
+
+    @unittest.skipUnless(numpy_backend.available(), 'numpy is not installed')
+    def test_should_export_csr_adjacency(self):
+        adjacency = self.graph.to_csr()
+
+        self.assertEqual(list(adjacency.node_ids), ['ExampleEmployee1', 'ExampleCompany1', 'ExampleEmployee2', 'Office'])
+        self.assertEqual(list(adjacency.indptr), [0, 1, 5, 6, 8])
+        self.assertEqual(list(adjacency.indices), [1, 0, 2, 3, 3, 1, 1, 1]) # in order of edges
+        self.assertEqual(list(self.graph.to_csr(directed=True).indptr), [0, 1, 3, 4, 4])
@@ -0,0 +1,113 @@
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+
+
+class SnapshotCompany(ExampleCompany):
+    def __init__(self, id: str = ''):
+        super().__init__(id)
+        self.lock = threading.Lock() # can't be deep copied
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.agraph.register_node_builder(ExampleEmployee, ExampleEmployee)
+        self.agraph.register_node('SnapshotCompany', SnapshotCompany('1'))
+        self.agraph.register_relation_builder(SnapshotCompany, ExampleEmployee, self.employ)
+        self.agraph.register_clone_hook(type(threading.Lock()), lambda lock: threading.Lock())
+        self.agraph.set_representation(r'''
+            ExampleEmployee1   ExampleEmployee2
+                            \ /
+                    SnapshotCompany
+        ''')
+        self.snapshot = self.agraph.build_snapshot()
+
+    @staticmethod
+    def employ(company: SnapshotCompany, employee: ExampleEmployee) -> None:
+        company.employees.append(employee)
+        employee.company = company
+
+    def test_should_clone_shared_references_once(self):
+        graph = self.snapshot.clone()
+        company = graph.node('SnapshotCompany')
+
+        self.assertIs(graph[0][1], graph[1][1])
+        self.assertIs(company.employees[0], graph.node('ExampleEmployee1'))
+        self.assertIs(company.employees[0].company, company)
+
+    def test_should_clone_independent_graphs(self):
+        graph1, graph2 = self.snapshot.clone(), self.snapshot.clone()
+
+        graph1.node('SnapshotCompany').employees.clear()
+
+        self.assertEqual(len(graph2.node('SnapshotCompany').employees), 2)
+        self.assertEqual(len(self.snapshot.clone().node('SnapshotCompany').employees), 2)
+
+    def test_should_use_clone_hooks(self):
+        lock = self.snapshot.clone().node('SnapshotCompany').lock
+
+        self.assertIsNot(lock, self.snapshot.clone().node('SnapshotCompany').lock)
+        self.assertFalse(lock.locked())
+
+    def test_should_deep_copy_not_picklable_graph(self):
+        class LocalEmployee(ExampleEmployee):
+            pass
+        self.agraph.register_node_builder(ExampleEmployee, LocalEmployee)
+
+        graph = self.agraph.build_snapshot().clone()
+
+        self.assertIsInstance(graph.node('ExampleEmployee1'), LocalEmployee)
+        self.assertIs(graph.node('ExampleEmployee1').company, graph.node('SnapshotCompany'))
+        self.assertIsNot(graph.node('SnapshotCompany').lock, self.snapshot.clone().node('SnapshotCompany').lock)
+
+    def test_should_raise_error_of_not_copyable_object_without_hook(self):
+        self.agraph.clone_hooks.clear()
+
+        with self.assertRaises(TypeError):
+            self.agraph.build_snapshot().clone()
+
+@unittest.skipUnless(importlib.util.find_spec('pytest'), 'pytest is not installed')
+class TestPytestPlugin(unittest.TestCase):
+    def test_should_build_snapshot_once_per_session(self):
+        test_module = r'''
+from agraph.agraph import AGraph
+from agraph.pytest_plugin import agraph_fixture
+
+pytest_plugins = ['agraph.pytest_plugin']
+agraphs = []
+
+def create_agraph():
+    agraph = AGraph()
+    agraph.register_node('N0', object())
+    agraph.register_node('N1', [])
+    agraph.set_representation('N0-N1')
+    agraphs.append(agraph)
+    return agraph
+
+graph = agraph_fixture(create_agraph)
+
+def test_first(graph):
+    graph.node('N1').append(1)
+
+def test_second(graph):
+    assert graph.node('N1') == []
+    assert len(agraphs) == 1
+'''
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'test_graph.py'), 'w') as file:
+                file.write(test_module)
+            root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+            result = subprocess.run(
+                [sys.executable, '-m', 'pytest', '-q', '-p', 'no:cacheprovider', directory],
+                cwd=directory, env=environment, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True
+            )
+
+        self.assertEqual(result.returncode, 0, result.stdout)
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.streaming import iter_topology_edges
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+from agraph.topology import compile_topology, split_representation_lines
+
+
+class TestIterTopologyEdges(unittest.TestCase):
+    def assertSameAsCompiled(self, representation: str) -> None:
+        topology = compile_topology(representation)
+        edges = list(iter_topology_edges(split_representation_lines(representation)))
+
+        self.assertEqual(sorted((node1.index, node2.index) for node1, node2 in edges), sorted(topology.edges))
+        for node1, node2 in edges:
+            self.assertEqual((node1.id, node2.id), (topology.node_ids[node1.index], topology.node_ids[node2.index]))
+
+    def test_should_find_edges_of_compiled_topology(self):
+        self.assertSameAsCompiled(r'''
+            N0  N1     N2
+              \ |     /
+               N3    /
+                    /
+            N4-----*
+        ''')
+        self.assertSameAsCompiled(r'''
+            N0-*
+               |
+               *
+                \
+              N2 *-N1
+              |
+              *--N4
+                 |
+                 N5
+        ''')
+
+    def test_should_mark_last_edges_of_nodes(self):
+        edges = list(iter_topology_edges(['N0-N1-N2', ' |', ' N3']))
+
+        last_flags = [(node.index, node.last) for edge in edges for node in edge]
+        self.assertEqual(sorted(last_flags), [(0, False), (0, True), (1, False), (1, True), (2, True), (3, True)])
+        self.assertEqual([node.last for edge in edges for node in edge if node.index == 0], [False, True])
+
+    def test_should_raise_error_of_illegal_representation(self):
+        with self.assertRaisesRegex(ValueError, 'Edge ends without a node at line 3, column 2'):
+            list(iter_topology_edges(['N0', ' |']))
+        with self.assertRaisesRegex(ValueError, 'Connector at line 1, column 4 joins 1 edges'):
+            list(iter_topology_edges(['N0-*']))
+
+class TestAGraphStreaming(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+        self.representation = 'ExampleEmployee1\n   |\nExampleCompany-ExampleEmployee2\n'
+
+    def test_should_build_edges_from_stream(self):
+        graph = list(self.agraph.iter_edges(self.representation.splitlines(keepends=True)))
+
+        self.assertEqual(len(graph), 2)
+        company = graph[0][1]
+        self.assertIs(graph[1][0], company)
+        self.assertEqual([employee.id for employee in company.employees], ['1', '2'])
+
+    def test_should_build_edges_from_file(self):
+        file_descriptor, path = tempfile.mkstemp(suffix='.agraph')
+        try:
+            with os.fdopen(file_descriptor, 'w') as file:
+                file.write(self.representation)
+            graph = list(self.agraph.build_from_file(path))
+        finally:
+            os.remove(path)
+
+        self.assertEqual([[type(node1), type(node2)] for node1, node2 in graph], [[ExampleEmployee, ExampleCompany], [ExampleCompany, ExampleEmployee]])
+        self.assertEqual(len(graph[0][1].employees), 2)
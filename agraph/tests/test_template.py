@@ -0,0 +1,147 @@
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.template import RelationDispatch, find_relation_builder
+from agraph.tests.models import ExampleCompany, ExampleDepartment, ExampleEmployee
+
+
+class TestAGraphTemplate(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+        self.template = self.agraph.compile_template(r'''
+            ExampleEmployee1  ExampleEmployee2
+                            \  /
+                       ExampleCompany
+        ''')
+
+    def test_should_instantiate_fresh_objects(self):
+        model1 = self.template.instantiate()
+        model2 = self.template.instantiate()
+
+        self.assertEqual(len(model1), 2)
+        self.assertIsNot(model1[0][1], model2[0][1])
+        self.assertIs(model1[0][1], model1[1][1])
+        company = model1[0][1]
+        self.assertEqual([employee.id for employee in company.employees], ['1', '2'])
+
+    def test_should_not_be_affected_by_later_registrations(self):
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: None)
+
+        company = self.template.instantiate()[0][1]
+
+        self.assertEqual(len(company.employees), 2)
+
+    def test_should_reuse_registered_nodes(self):
+        company = ExampleCompany('registered')
+        self.agraph.register_node('C', company)
+        template = self.agraph.compile_template(r'C-ExampleEmployee')
+
+        self.assertIs(template.instantiate()[0][0], company)
+        self.assertIs(template.instantiate()[0][0], company)
+        self.assertEqual(len(company.employees), 2)
+
+class TemplateWorker:
+    pass
+
+class TestGeneratedTemplate(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+        self.representation = r'''
+            ExampleEmployee1  ExampleEmployee2
+                            \  /
+                       ExampleCompany-ExampleDepartment
+        '''
+
+    def test_should_generate_source_after_first_instantiation(self):
+        template = self.agraph.compile_template(self.representation, generate_code=True)
+        self.assertIsNone(template.source)
+
+        template.instantiate()
+
+        self.assertIn('def instantiate():', template.source)
+
+    def test_should_instantiate_as_not_generated_template(self):
+        expected = self.agraph.compile_template(self.representation).instantiate()
+        template = self.agraph.compile_template(self.representation, generate_code=True)
+
+        for model in (template.instantiate(), template.instantiate()):
+            self.assertEqual([[type(node1), type(node2)] for node1, node2 in model], [[type(node1), type(node2)] for node1, node2 in expected])
+            company = model[0][1]
+            self.assertIs(model[1][1], company)
+            self.assertEqual([employee.id for employee in company.employees], ['1', '2'])
+        self.assertIsNot(template.instantiate()[0][1], model[0][1])
+
+    def test_should_dispatch_relations_of_nodes_with_other_types(self):
+        employees = [ExampleEmployee('employee'), ExampleDepartment('department')]
+        self.agraph.register_node_builder(TemplateWorker, lambda *_: employees.pop(0))
+        template = self.agraph.compile_template(r'ExampleCompany-TemplateWorker', generate_code=True)
+
+        self.assertEqual(len(template.instantiate()[0][0].employees), 1)
+        self.assertEqual(len(template.instantiate()[0][0].employees), 0)
+
+    def test_should_build_relations_with_bulk_relation_builder(self):
+        bulk_calls = []
+        self.agraph.register_bulk_relation_builder(ExampleDepartment, ExampleEmployee, lambda pairs: bulk_calls.append([(department.id, employee.id) for department, employee in pairs]))
+        template = self.agraph.compile_template(r'ExampleEmployee1-ExampleDepartment-ExampleEmployee2', generate_code=True)
+
+        template.instantiate()
+        template.instantiate()
+
+        self.assertEqual(bulk_calls, [[('', '1'), ('', '2')], [('', '1'), ('', '2')]])
+
+    def test_should_build_nodes_with_bulk_node_builder(self):
+        bulk_calls = []
+        self.agraph.register_bulk_node_builder(TemplateWorker, lambda ids: bulk_calls.append(ids) or [ExampleEmployee(id) for id in ids])
+        template = self.agraph.compile_template(r'TemplateWorker1-ExampleCompany-TemplateWorker2', generate_code=True)
+
+        for _ in range(2):
+            company = template.instantiate()[0][1]
+            self.assertEqual([employee.id for employee in company.employees], ['1', '2'])
+        self.assertEqual(bulk_calls, [['1', '2'], ['1', '2']])
+
+class TemplateSubsidiary(ExampleCompany):
+    pass
+
+class TemplateManager(ExampleEmployee):
+    pass
+
+class TestRelationDispatch(unittest.TestCase):
+    def test_should_find_builder_of_base_types_in_either_orientation(self):
+        relation_builders = {ExampleCompany: {ExampleEmployee: 'company-employee'}}
+
+        self.assertEqual(find_relation_builder(relation_builders, TemplateSubsidiary, TemplateManager), ('company-employee', False))
+        self.assertEqual(find_relation_builder(relation_builders, TemplateManager, TemplateSubsidiary), ('company-employee', True))
+        self.assertIsNone(find_relation_builder(relation_builders, TemplateManager, ExampleEmployee))
+
+    def test_should_find_most_specific_builder(self):
+        relation_builders = {
+            ExampleCompany: {ExampleEmployee: 'company-employee', object: 'company-object'},
+            TemplateManager: {TemplateSubsidiary: 'manager-subsidiary'},
+            object: {ExampleEmployee: 'object-employee'},
+        }
+
+        self.assertEqual(find_relation_builder(relation_builders, TemplateSubsidiary, TemplateManager), ('manager-subsidiary', True))
+        self.assertEqual(find_relation_builder(relation_builders, ExampleCompany, TemplateManager), ('company-employee', False))
+        self.assertEqual(find_relation_builder(relation_builders, ExampleCompany, ExampleDepartment), ('company-object', False))
+        self.assertEqual(find_relation_builder(relation_builders, ExampleDepartment, ExampleEmployee), ('object-employee', False))
+
+    def test_should_memoize_builders_by_types(self):
+        relation_builders = {ExampleCompany: {ExampleEmployee: 'company-employee'}}
+        relation_dispatch = RelationDispatch(relation_builders)
+
+        self.assertEqual(relation_dispatch.find(TemplateSubsidiary, TemplateManager), ('company-employee', False))
+        relation_builders[TemplateSubsidiary] = {TemplateManager: 'subsidiary-manager'}
+
+        self.assertEqual(relation_dispatch.find(TemplateSubsidiary, TemplateManager), ('company-employee', False))
+
+    def test_should_dispatch_to_builders_registered_later(self):
+        agraph = AGraph()
+        agraph.register_relation_builder(ExampleCompany, ExampleEmployee, lambda company, employee: company.employees.append(employee))
+        agraph.set_representation('TemplateManager-TemplateSubsidiary')
+        self.assertEqual(len(agraph.build()[0][1].employees), 1)
+
+        agraph.register_relation_builder(TemplateSubsidiary, ExampleEmployee, lambda company, employee: None)
+
+        self.assertEqual(len(agraph.build()[0][1].employees), 0)
@@ -0,0 +1,63 @@
+import threading
+import time
+import unittest
+
+from agraph.agraph import AGraph
+from agraph.tests.models import ExampleCompany, ExampleEmployee
+
+
+class TestAGraphThreadedBuild(unittest.TestCase):
+    def setUp(self):
+        self.agraph = AGraph()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.agraph.register_relation_builder(ExampleCompany, ExampleEmployee, self.add_employee)
+        self.agraph.set_representation(r'''
+            ExampleEmployee1  ExampleEmployee2
+                            \  /
+                       ExampleCompany-ExampleEmployee3
+        ''')
+
+    def add_employee(self, company: ExampleCompany, employee: ExampleEmployee) -> None:
+        with self.lock:
+            company.employees.append(employee)
+
+    def build_employee(self, id: str) -> ExampleEmployee:
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return ExampleEmployee(id)
+
+    def test_should_build_nodes_concurrently(self):
+        self.agraph.register_node_builder(ExampleEmployee, self.build_employee)
+
+        graph = self.agraph.build(workers=4)
+
+        self.assertEqual([[node1.id, node2.id] for node1, node2 in graph], [['1', ''], ['2', ''], ['', '3']])
+        company = graph[0][1]
+        self.assertIs(graph[1][1], company)
+        self.assertIs(graph[2][0], company)
+        self.assertEqual(sorted(employee.id for employee in company.employees), ['1', '2', '3'])
+        self.assertEqual(self.max_running, 3)
+
+    def test_should_build_serially_by_default(self):
+        self.agraph.register_node_builder(ExampleEmployee, self.build_employee)
+
+        graph = self.agraph.build()
+
+        self.assertEqual([employee.id for employee in graph[0][1].employees], ['1', '2', '3'])
+        self.assertEqual(self.max_running, 1)
+
+    def test_should_raise_first_builder_exception(self):
+        def build_employee(id: str) -> ExampleEmployee:
+            if id == '2':
+                raise RuntimeError('employee 2')
+            return self.build_employee(id)
+        self.agraph.register_node_builder(ExampleEmployee, build_employee)
+
+        with self.assertRaisesRegex(RuntimeError, 'employee 2'):
+            self.agraph.build(workers=4)
@@ -0,0 +1,29 @@
+import unittest
+
+from agraph.edge import HorizontalEdge, AsteriskConnector, VerticalEdge
+from agraph.tokenizer import EDGES_TOKEN, NODE_TOKEN, tokenize
+
+
+class TestTokenizer(unittest.TestCase):
+    def test_should_separate_nodes_and_edges(self):
+        tokens = list(tokenize(r'N1--*N12'))
+
+        self.assertEqual(tokens, [
+            (NODE_TOKEN, 'N1', 0),
+            (EDGES_TOKEN, bytes([HorizontalEdge.kind, HorizontalEdge.kind, AsteriskConnector.kind]), 2),
+            (NODE_TOKEN, 'N12', 5),
+        ])
+
+    def test_should_skip_whitespaces(self):
+        tokens = list(tokenize('  N1 \t| N2  '))
+
+        self.assertEqual(tokens, [
+            (NODE_TOKEN, 'N1', 2),
+            (EDGES_TOKEN, bytes([VerticalEdge.kind]), 6),
+            (NODE_TOKEN, 'N2', 8),
+        ])
+
+    def test_should_keep_repeated_nodes(self):
+        tokens = list(tokenize(r'N0 N0/N0'))
+
+        self.assertEqual([(token, start) for token, _, start in tokens], [(NODE_TOKEN, 0), (NODE_TOKEN, 3), (EDGES_TOKEN, 5), (NODE_TOKEN, 6)])
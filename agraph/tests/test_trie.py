@@ -0,0 +1,30 @@
+import unittest
+
+from agraph.trie import PrefixTrie
+
+
+class TestPrefixTrie(unittest.TestCase):
+    def setUp(self):
+        self.trie = PrefixTrie()
+        self.trie.insert('Company', 'company')
+        self.trie.insert('CompanyBranch', 'company_branch')
+        self.trie.insert('Employee', 'employee')
+
+    def test_should_match_whole_key(self):
+        self.assertEqual(self.trie.longest_prefix('Company'), ('Company', 'company'))
+
+    def test_should_match_key_with_suffix(self):
+        self.assertEqual(self.trie.longest_prefix('Employee12'), ('Employee', 'employee'))
+
+    def test_should_prefer_longest_matching_key(self):
+        self.assertEqual(self.trie.longest_prefix('CompanyBranch1'), ('CompanyBranch', 'company_branch'))
+        self.assertEqual(self.trie.longest_prefix('CompanyBran'), ('Company', 'company'))
+
+    def test_should_not_match_unknown_prefix(self):
+        self.assertIsNone(self.trie.longest_prefix('Compan'))
+        self.assertIsNone(self.trie.longest_prefix(''))
+
+    def test_should_overwrite_value_of_inserted_key(self):
+        self.trie.insert('Company', 'other_company')
+
+        self.assertEqual(self.trie.longest_prefix('Company1'), ('Company', 'other_company'))
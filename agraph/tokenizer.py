@@ -0,0 +1,21 @@
+import re
+
+from typing import Iterator, Tuple, Union
+
+from agraph.edge import EDGES
+
+
+NODE_TOKEN = 1
+EDGES_TOKEN = 2
+
+EDGE_CHARACTERS = ''.join(edge.character for edge in EDGES)
+EDGE_KINDS_TRANSLATION = bytes.maketrans(EDGE_CHARACTERS.encode('ascii'), bytes(edge.kind for edge in EDGES))
+TOKEN_PATTERN = re.compile(r'(?P<node>[^\s{0}]+)|(?P<edges>[{0}]+)'.format(re.escape(EDGE_CHARACTERS)))
+
+def tokenize(line: str) -> Iterator[Tuple[int, Union[str, bytes], int]]:
+    # 'N1--*N12' => (NODE_TOKEN, 'N1', 0), (EDGES_TOKEN, <kinds of '--*'>, 2), (NODE_TOKEN, 'N12', 5)
+    for match in TOKEN_PATTERN.finditer(line):
+        if match.lastindex == NODE_TOKEN:
+            yield NODE_TOKEN, match.group(), match.start()
+        else:
+            yield EDGES_TOKEN, match.group().encode('ascii').translate(EDGE_KINDS_TRANSLATION), match.start()
@@ -0,0 +1,70 @@
+import struct
+import sys
+
+from array import array
+from typing import List, NamedTuple, Tuple
+
+from agraph import parser
+from agraph.connectivity import resolve_edges
+from agraph.grid import Grid
+
+
+TOPOLOGY_VERSION = 1 # must change whenever the same representation could compile to a different topology
+
+PYTHON_BACKEND = 'python'
+NUMPY_BACKEND = 'numpy' # falls back to python backend if numpy is not installed
+AUTO_BACKEND = 'auto' # numpy backend for diagrams of at least NUMPY_BACKEND_MIN_CELLS cells
+PARALLEL_BACKEND = 'parallel' # bands of a diagram resolved in worker processes, see agraph.bands
+NUMPY_BACKEND_MIN_CELLS = 50000
+
+class Topology(NamedTuple):
+    # 'N0-N1 N0' => Topology(node_ids=('N0', 'N1', 'N0'), edges=((0, 1),))
+    node_ids: Tuple[str, ...] # node occurrences, row by row
+    edges: Tuple[Tuple[int, int], ...] # pairs of connected node occurrences' indices
+
+    __HEADER = struct.Struct('<4sIII') # magic, version, node ids' bytes length, edges count
+    __MAGIC = b'AGT\0'
+
+    def to_bytes(self) -> bytes:
+        node_ids = '\n'.join(self.node_ids).encode('utf-8') # node ids can't contain white characters
+        edges = array('I', [node_index for edge in self.edges for node_index in edge])
+        if sys.byteorder == 'big':
+            edges.byteswap()
+        return self.__HEADER.pack(self.__MAGIC, TOPOLOGY_VERSION, len(node_ids), len(self.edges)) + node_ids + edges.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Topology':
+        magic, version, node_ids_length, edges_count = cls.__HEADER.unpack_from(data)
+        if magic != cls.__MAGIC or version != TOPOLOGY_VERSION:
+            raise ValueError('Not a compatible topology')
+        node_ids_end = cls.__HEADER.size + node_ids_length
+        node_ids = data[cls.__HEADER.size:node_ids_end].decode('utf-8')
+        edges = array('I')
+        edges.frombytes(data[node_ids_end:])
+        if len(edges) != 2 * edges_count:
+            raise ValueError('Truncated topology')
+        if sys.byteorder == 'big':
+            edges.byteswap()
+        return cls(tuple(node_ids.split('\n')) if node_ids else (), tuple(zip(edges[::2], edges[1::2])))
+
+def compile_topology(representation: str, backend: str = AUTO_BACKEND) -> Topology:
+    if backend == PARALLEL_BACKEND:
+        from agraph.bands import compile_topology_in_bands # bands depend on topology
+        return compile_topology_in_bands(representation)
+    grid, edge_starts = parse_lines(split_representation_lines(representation), backend)
+    return Topology(tuple(grid.node_ids), tuple(resolve_edges(grid, edge_starts)))
+
+def parse_lines(lines: List[str], backend: str = AUTO_BACKEND) -> Tuple[Grid, List[int]]:
+    if backend == NUMPY_BACKEND or backend == AUTO_BACKEND and len(lines) * max(map(len, lines)) >= NUMPY_BACKEND_MIN_CELLS:
+        from agraph import numpy_backend # imports numpy, so only when needed
+        if numpy_backend.available():
+            return numpy_backend.parse(lines)
+    return parser.parse(lines)
+
+def split_representation_lines(representation: str) -> List[str]:
+    lines = representation.splitlines()
+    if len(lines[0]) == 0 or lines[0].isspace():
+        del lines[0]
+    if len(lines[-1]) == 0 or lines[-1].isspace():
+        del lines[-1]
+    return lines
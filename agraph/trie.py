@@ -0,0 +1,30 @@
+from typing import Generic, Optional, Tuple, TypeVar
+
+
+T = TypeVar('T')
+
+class PrefixTrie(Generic[T]):
+    __VALUE = None # Children are keyed by characters, so None key can hold the value
+
+    def __init__(self):
+        self.__root: dict = {}
+
+    def insert(self, key: str, value: T) -> None:
+        node = self.__root
+        for character in key:
+            node = node.setdefault(character, {})
+        node[self.__VALUE] = value
+
+    def longest_prefix(self, text: str) -> Optional[Tuple[str, T]]:
+        # 'Company12' => ('Company', <value of 'Company'>)
+        match = None
+        node = self.__root
+        for index, character in enumerate(text):
+            node = node.get(character)
+            if node is None:
+                break
+            if self.__VALUE in node:
+                match = (index + 1, node[self.__VALUE])
+        if match is None:
+            return None
+        return text[:match[0]], match[1]
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+
+from typing import Tuple
+
+from agraph.bands import compile_topology_in_bands
+from agraph.topology import PYTHON_BACKEND, Topology, compile_topology
+
+
+# Serial engine against bands resolved by 1, 2, 4... workers, up to the number of cores:
+# PYTHONPATH=. python benchmarks/bands.py [lines]
+
+TILE = [
+    r'N0-N1    N2--*  N3  ',
+    r'|    \       |  |   ',
+    r'N4    N5    N6  *-N7',
+    r'       |            ',
+    r'  N8---*  N9        ',
+]
+
+def diagram(lines: int, tiles_per_line: int = 8) -> str:
+    rows = []
+    while len(rows) < lines:
+        rows.extend(' '.join([row] * tiles_per_line) for row in TILE)
+        rows.append('')
+    return '\n'.join(rows[:lines - lines % (len(TILE) + 1)])
+
+def measure(compile, representation: str) -> Tuple[float, Topology]:
+    start = time.perf_counter()
+    topology = compile(representation)
+    return time.perf_counter() - start, topology
+
+if __name__ == '__main__':
+    representation = diagram(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
+    serial_time, serial_topology = measure(lambda representation: compile_topology(representation, PYTHON_BACKEND), representation)
+    print(f'cores: {os.cpu_count()}')
+    print(f'serial engine: {serial_time:.2f}s')
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        # band_rows forces bands even for one worker, which is otherwise compiled serially
+        bands_time, topology = measure(lambda representation: compile_topology_in_bands(representation, workers, band_rows=-(-representation.count('\n') // workers)), representation)
+        assert topology == serial_topology
+        print(f'bands, {workers} workers: {bands_time:.2f}s ({serial_time / bands_time:.2f}x)')
+        workers *= 2
@@ -13,6 +13,7 @@ setup(
     download_url = f'https://github.com/BoskieBuenos/agraph/archive/v{version}.tar.gz', # TODO
     keywords = [''], # TODO
     install_requires=[],
+    extras_require={'numpy': ['numpy']}, # array backend for large diagrams
     classifiers=[
         'Development Status :: 2 - Pre-Alpha',
         'Intended Audience :: Developers',